@@ -26,6 +26,31 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Sessão compartilhada: reaproveita conexões com o MinIO entre downloads
+_session = requests.Session()
+
+
+class _ConteudoMinio:
+    """
+    Conteúdo de uma resposta em streaming do MinIO para o StreamingHttpResponse.
+    Fecha a resposta (devolvendo a conexão à sessão) ao fim da iteração ou quando
+    o Django encerra a resposta, mesmo que o cliente desconecte antes do primeiro chunk.
+    """
+    
+    def __init__(self, response, chunk_size=8192):
+        self._response = response
+        self._chunk_size = chunk_size
+    
+    def __iter__(self):
+        try:
+            yield from self._response.iter_content(chunk_size=self._chunk_size)
+        finally:
+            self.close()
+    
+    def close(self):
+        self._response.close()
+
+
 class AnexoViewSet(viewsets.ModelViewSet):
     """
     ViewSet para gerenciar anexos de intercorrências.
@@ -703,6 +728,7 @@ class AnexoViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
         
+        minio_response = None
         try:
             # Gera URL pré-assinada através do storage do MinIO
             url_download = anexo.arquivo.url
@@ -716,7 +742,7 @@ class AnexoViewSet(viewsets.ModelViewSet):
             )
             
             # Faz requisição ao MinIO sem headers de autenticação
-            minio_response = requests.get(url_download, stream=True)
+            minio_response = _session.get(url_download, stream=True)
             minio_response.raise_for_status()
             
             # Determinar content type
@@ -724,7 +750,7 @@ class AnexoViewSet(viewsets.ModelViewSet):
             
             # Retorna o arquivo como streaming response
             file_response = StreamingHttpResponse(
-                minio_response.iter_content(chunk_size=8192),
+                _ConteudoMinio(minio_response),
                 content_type=content_type
             )
             
@@ -742,6 +768,8 @@ class AnexoViewSet(viewsets.ModelViewSet):
             return file_response
             
         except requests.RequestException as e:
+            if minio_response is not None:
+                minio_response.close()
             logger.error(
                 f"Erro ao fazer download do MinIO para anexo {anexo.uuid}: {str(e)}"
             )
@@ -750,6 +778,8 @@ class AnexoViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
         except Exception as e:
+            if minio_response is not None:
+                minio_response.close()
             logger.error(
                 f"Erro ao processar download para anexo {anexo.uuid}: {str(e)}"
             )
@@ -1,24 +1,42 @@
 from django.conf import settings
 import requests
 import logging
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 logger = logging.getLogger(__name__)
 
 
 class ExternalServiceError(Exception): ...
 
 BASE = settings.INTERCORRENCIAS_API_URL.rstrip('/')
+VERIFY_INTERCORRENCIA_URL = f"{BASE}/verify-intercorrencia/"
+
+# Timeout (conexão, leitura) em segundos.
+# Só falhas de conexão são repetidas (até 2 vezes); leituras não são refeitas.
+# Pior caso por chamada: 3 tentativas de conexão (3s) + backoff (~0,3s) + leitura (5s) ≈ 8,3s
+TIMEOUT = (1, 5)
+
+# Sessão compartilhada: mantém conexões keep-alive com o serviço de intercorrências
+_session = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=10,
+    max_retries=Retry(total=2, connect=2, read=0, backoff_factor=0.1),
+)
+_session.mount('http://', _adapter)
+_session.mount('https://', _adapter)
 
 def get_detalhes_intercorrencia(intercorrencia_uuid: str, token: str) -> dict | None:
     
     """Obtém detalhes da intercorrência a partir do serviço externo."""
     
-    url = f"{BASE}/verify-intercorrencia/{intercorrencia_uuid}/"
+    url = f"{VERIFY_INTERCORRENCIA_URL}{intercorrencia_uuid}/"
     headers = {
         "Authorization": f"Bearer {token}"
     }
     
     try:
-        response = requests.get(url, headers=headers, timeout=5)
+        response = _session.get(url, headers=headers, timeout=TIMEOUT)
         response.raise_for_status()
         return response.json()
     except requests.HTTPError as e:
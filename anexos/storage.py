@@ -8,12 +8,57 @@ from django.conf import settings
 from django.utils.deconstruct import deconstructible
 from minio import Minio
 from minio.error import S3Error
-from io import BytesIO
+from io import BytesIO, UnsupportedOperation
 from urllib.parse import urljoin
 from datetime import timedelta
 import os
 
 
+class _MinioFile(File):
+    """
+    Arquivo lido diretamente da resposta do MinIO, sem carregá-lo inteiro na memória.
+    A conexão é liberada ao fechar o arquivo.
+    
+    A resposta HTTP não é posicionável: open() e seek(0) refazem o download
+    desde o início quando algo já foi lido ou o arquivo foi fechado; qualquer
+    outro seek lança io.UnsupportedOperation.
+    """
+    
+    def __init__(self, response, name, storage):
+        super().__init__(response, name)
+        self._storage = storage
+        
+        # O tamanho vem do cabeçalho; sem ele, consulta os metadados do objeto
+        content_length = response.headers.get('Content-Length')
+        if content_length is not None:
+            self.size = int(content_length)
+        else:
+            self.size = storage.size(name)
+    
+    def open(self, mode=None):
+        self._voltar_ao_inicio()
+        return self
+    
+    def seek(self, offset, whence=os.SEEK_SET):
+        if offset != 0 or whence != os.SEEK_SET:
+            raise UnsupportedOperation(
+                "Arquivo do MinIO é lido em streaming; só é possível voltar ao início (seek(0))"
+            )
+        self._voltar_ao_inicio()
+        return 0
+    
+    def close(self):
+        self.file.close()
+        self.file.release_conn()
+    
+    def _voltar_ao_inicio(self):
+        """Refaz o download apenas se o arquivo foi fechado ou já teve bytes lidos"""
+        # tell() da resposta indica quantos bytes já foram lidos
+        if self.closed or self.file.tell():
+            self.close()
+            self.file = self._storage._get_object(self.name)
+
+
 @deconstructible
 class MinioStorage(Storage):
     """
@@ -28,6 +73,7 @@ class MinioStorage(Storage):
         self.use_https = settings.MINIO_USE_HTTPS
         self.base_url = settings.MINIO_STORAGE_MEDIA_BASE_URL
         self.expires = settings.MINIO_STORAGE_PRESIGNED_URL_TTL
+        self.part_size = settings.MINIO_PART_SIZE
 
         logger = logging.getLogger(__name__)
         logger.warning(f"MinioStorage initialized with endpoint: {self.endpoint}, bucket: {self.bucket_name}, expires: {self.expires} minutes")
@@ -54,18 +100,25 @@ class MinioStorage(Storage):
     def _save(self, name, content):
         """Salva um arquivo no MinIO"""
         try:
-            # Ler conteúdo do arquivo
+            content_type = getattr(content, 'content_type', 'application/octet-stream')
             content.seek(0)
-            file_data = content.read()
-            file_size = len(file_data)
+            
+            # Tamanho conhecido: envia o arquivo em partes, sem carregá-lo inteiro na memória.
+            # Tamanho desconhecido: lê o conteúdo para medir (nunca envia length=-1 ao MinIO)
+            file_size = getattr(content, 'size', None)
+            if not file_size:
+                file_data = content.read()
+                file_size = len(file_data)
+                content = BytesIO(file_data)
             
             # Upload para MinIO
             self.client.put_object(
                 self.bucket_name,
                 name,
-                BytesIO(file_data),
+                content,
                 file_size,
-                content_type=getattr(content, 'content_type', 'application/octet-stream')
+                content_type=content_type,
+                part_size=self.part_size
             )
             
             return name
@@ -74,13 +127,12 @@ class MinioStorage(Storage):
     
     def _open(self, name, mode='rb'):
         """Abre um arquivo do MinIO"""
+        return _MinioFile(self._get_object(name), name, self)
+    
+    def _get_object(self, name):
+        """Obtém a resposta em streaming de um objeto do MinIO"""
         try:
-            response = self.client.get_object(self.bucket_name, name)
-            file_data = response.read()
-            response.close()
-            response.release_conn()
-            
-            return File(BytesIO(file_data), name)
+            return self.client.get_object(self.bucket_name, name)
         except S3Error as e:
             raise IOError(f"Erro ao abrir arquivo do MinIO: {e}")
     
@@ -126,13 +178,26 @@ class MinioStorage(Storage):
     
     def get_available_name(self, name, max_length=None):
         """Retorna um nome de arquivo disponível"""
+        dir_name, file_name = os.path.split(name)
+        file_root, file_ext = os.path.splitext(file_name)
+        
+        # Uma única listagem traz o nome original e todas as variações com sufixo
+        try:
+            existentes = {
+                obj.object_name
+                for obj in self.client.list_objects(
+                    self.bucket_name,
+                    prefix=os.path.join(dir_name, file_root),
+                    recursive=False
+                )
+            }
+        except S3Error:
+            existentes = set()
+        
         # Se o arquivo existe, gera um nome único adicionando um sufixo
-        if self.exists(name):
-            dir_name, file_name = os.path.split(name)
-            file_root, file_ext = os.path.splitext(file_name)
-            count = 1
-            while self.exists(name):
-                name = os.path.join(dir_name, f"{file_root}_{count}{file_ext}")
-                count += 1
+        count = 1
+        while name in existentes:
+            name = os.path.join(dir_name, f"{file_root}_{count}{file_ext}")
+            count += 1
         
         return name
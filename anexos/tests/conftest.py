@@ -1,8 +1,12 @@
+import itertools
 import os
+import uuid
 import pytest
 from pytest_factoryboy import register
-from django.test import Client
+from django.core.cache import cache
+from django.test import Client, override_settings
 from django.core.files.uploadedfile import SimpleUploadedFile
+from rest_framework.test import APIRequestFactory
 from unittest.mock import Mock, patch, MagicMock
 from io import BytesIO
 
@@ -29,22 +33,79 @@ def client():
     return Client()
 
 
+@pytest.fixture(scope='session', autouse=True)
+def _password_hasher_rapido():
+    """
+    Usa MD5 para hash de senhas nos testes.
+    O PBKDF2 padrão é propositalmente lento e os testes não dependem dele.
+    """
+    with override_settings(
+        PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher']
+    ):
+        yield
+
+
+@pytest.fixture(scope='session', autouse=True)
+def _cache_em_memoria():
+    """Garante o LocMemCache nos testes, independente do backend configurado"""
+    with override_settings(
+        CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+    ):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache(_cache_em_memoria):
+    """Isola o cache (ex.: payloads de JWT e dados de usuário) entre os testes"""
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(scope='session')
+def fast_uuid():
+    """
+    Gera UUIDs (versão 4) únicos e determinísticos a partir de um contador.
+    Para testes que precisam apenas de unicidade, não de aleatoriedade.
+    """
+    contador = itertools.count(1)
+    return lambda: uuid.UUID(int=next(contador), version=4)
+
+
+@pytest.fixture(scope='session')
+def api_rf():
+    """APIRequestFactory compartilhada por toda a sessão de testes"""
+    return APIRequestFactory()
+
+
+@pytest.fixture(scope='session')
+def _pdf_bytes():
+    """Conteúdo do PDF mockado, alocado uma única vez por sessão"""
+    return b'%PDF-1.4 fake pdf content for testing'
+
+
+@pytest.fixture(scope='session')
+def _imagem_bytes():
+    """Conteúdo da imagem mockada, alocado uma única vez por sessão"""
+    return b'\xff\xd8\xff\xe0\x00\x10JFIF fake jpeg content'
+
+
 @pytest.fixture
-def arquivo_pdf_mock():
+def arquivo_pdf_mock(_pdf_bytes):
     """Retorna um arquivo PDF mockado para testes"""
     return SimpleUploadedFile(
         name='documento.pdf',
-        content=b'%PDF-1.4 fake pdf content for testing',
+        content=_pdf_bytes,
         content_type='application/pdf'
     )
 
 
 @pytest.fixture
-def arquivo_imagem_mock():
+def arquivo_imagem_mock(_imagem_bytes):
     """Retorna um arquivo de imagem mockado para testes"""
     return SimpleUploadedFile(
         name='imagem.jpg',
-        content=b'\xff\xd8\xff\xe0\x00\x10JFIF fake jpeg content',
+        content=_imagem_bytes,
         content_type='image/jpeg'
     )
 
@@ -74,7 +135,11 @@ def mock_minio_storage(monkeypatch):
         def delete(self, name):
             """Simula exclusão"""
             pass
-        
+
+        def exists(self, name):
+            """Simula verificação de existência - nenhum arquivo é persistido"""
+            return False
+
         def size(self, name):
             """Simula retorno de tamanho"""
             return 1024
@@ -92,3 +92,12 @@ class AnexoGIPEFactory(AnexoFactory):
     perfil = Anexo.PERFIL_GIPE
     categoria = "relatorio_supervisao_escolar"
 
+
+
+class AnexoMetadadosFactory(AnexoFactory):
+    """
+    Factory para anexos em que apenas os metadados importam (ex.: tamanho_bytes).
+    O arquivo é referenciado apenas pelo nome, sem passar pelo storage.
+    """
+    
+    arquivo = 'anexos/stub.pdf'
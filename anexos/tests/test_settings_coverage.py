@@ -7,6 +7,8 @@ import sys
 from importlib import reload
 from unittest.mock import patch
 
+from django.core.exceptions import ImproperlyConfigured
+
 
 class TestSettingsMinioExternalEndpoint:
     """Testes para branch MINIO_EXTERNAL_ENDPOINT em settings.py"""
@@ -64,6 +66,76 @@ class TestSettingsMinioExternalEndpoint:
             assert settings.MINIO_STORAGE_MEDIA_BASE_URL.startswith('http')
 
 
+class TestSettingsBancoEmMemoria:
+    """Testes para branch USE_INMEMORY_DB em settings.py"""
+    
+    def test_use_inmemory_db_usa_sqlite_em_memoria(self):
+        """Testa que USE_INMEMORY_DB dispensa as variáveis do Postgres"""
+        with patch.dict(os.environ, {
+            'DJANGO_SECRET_KEY': 'test_secret_key',
+            'USE_INMEMORY_DB': 'True',
+        }, clear=True):
+            if 'config.settings' in sys.modules:
+                del sys.modules['config.settings']
+            
+            import config.settings as settings
+            
+            assert settings.DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3'
+            assert settings.DATABASES['default']['NAME'] == ':memory:'
+
+
+class TestSettingsMinioPartSize:
+    """Testes para a validação de MINIO_PART_SIZE em settings.py"""
+    
+    @pytest.mark.parametrize('part_size', [
+        str(5 * 1024 * 1024 - 1),
+        str(5 * 1024 * 1024 * 1024 + 1),
+        '64MB',
+    ], ids=['abaixo_do_minimo', 'acima_do_maximo', 'nao_numerico'])
+    def test_part_size_fora_do_intervalo_falha_ao_carregar(self, part_size):
+        """Testa que valor inválido ou fora de 5MB-5GB falha ao carregar settings"""
+        settings_original = sys.modules.pop('config.settings', None)
+        try:
+            with patch.dict(os.environ, {
+                'DJANGO_SECRET_KEY': 'test_secret_key',
+                'USE_INMEMORY_DB': 'True',
+                'MINIO_PART_SIZE': part_size,
+            }, clear=True):
+                with pytest.raises(ImproperlyConfigured, match='MINIO_PART_SIZE'):
+                    import config.settings  # noqa: F401
+        finally:
+            if settings_original is not None:
+                sys.modules['config.settings'] = settings_original
+    
+    def test_part_size_vazio_usa_padrao(self):
+        """Testa que MINIO_PART_SIZE vazio (ex.: copiado do .env.sample) usa o padrão"""
+        with patch.dict(os.environ, {
+            'DJANGO_SECRET_KEY': 'test_secret_key',
+            'USE_INMEMORY_DB': 'True',
+            'MINIO_PART_SIZE': '',
+        }, clear=True):
+            if 'config.settings' in sys.modules:
+                del sys.modules['config.settings']
+            
+            import config.settings as settings
+            
+            assert settings.MINIO_PART_SIZE == 64 * 1024 * 1024
+    
+    def test_part_size_no_limite_minimo_aceito(self):
+        """Testa que exatamente 5MB é aceito"""
+        with patch.dict(os.environ, {
+            'DJANGO_SECRET_KEY': 'test_secret_key',
+            'USE_INMEMORY_DB': 'True',
+            'MINIO_PART_SIZE': str(5 * 1024 * 1024),
+        }, clear=True):
+            if 'config.settings' in sys.modules:
+                del sys.modules['config.settings']
+            
+            import config.settings as settings
+            
+            assert settings.MINIO_PART_SIZE == 5 * 1024 * 1024
+
+
 class TestUrlsDebugMode:
     """Testes para branch DEBUG em config/urls.py"""
     
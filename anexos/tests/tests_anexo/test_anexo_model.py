@@ -202,41 +202,31 @@ class TestAnexoModel:
         total = Anexo.get_tamanho_total_intercorrencia(uuid_intercorrencia)
         assert total == 3072  # 1024 + 2048
     
-    def test_pode_adicionar_anexo_dentro_do_limite(self):
-        """Testa validação de limite de tamanho - dentro do limite"""
+    @pytest.mark.parametrize(
+        "tamanho_existente, tamanho_novo, esperado",
+        [
+            # 5MB + 4MB = 9MB (dentro do limite de 10MB)
+            (5 * 1024 * 1024, 4 * 1024 * 1024, True),
+            # 8MB + 3MB = 11MB (excede o limite de 10MB)
+            (8 * 1024 * 1024, 3 * 1024 * 1024, False),
+        ],
+        ids=["dentro_do_limite", "fora_do_limite"],
+    )
+    def test_pode_adicionar_anexo(self, tamanho_existente, tamanho_novo, esperado):
+        """Testa validação de limite de tamanho por intercorrência"""
         uuid_intercorrencia = '123e4567-e89b-12d3-a456-426614174000'
         
-        # Criar anexo de 5MB
         AnexoFactory(
             intercorrencia_uuid=uuid_intercorrencia,
-            tamanho_bytes=5 * 1024 * 1024
+            tamanho_bytes=tamanho_existente
         )
         
-        # Tentar adicionar mais 4MB (total 9MB - dentro do limite de 10MB)
         pode_adicionar = Anexo.pode_adicionar_anexo(
             uuid_intercorrencia,
-            4 * 1024 * 1024
+            tamanho_novo
         )
         
-        assert pode_adicionar is True
-    
-    def test_pode_adicionar_anexo_fora_do_limite(self):
-        """Testa validação de limite de tamanho - fora do limite"""
-        uuid_intercorrencia = '123e4567-e89b-12d3-a456-426614174000'
-        
-        # Criar anexo de 8MB
-        AnexoFactory(
-            intercorrencia_uuid=uuid_intercorrencia,
-            tamanho_bytes=8 * 1024 * 1024
-        )
-        
-        # Tentar adicionar mais 3MB (total 11MB - excede limite de 10MB)
-        pode_adicionar = Anexo.pode_adicionar_anexo(
-            uuid_intercorrencia,
-            3 * 1024 * 1024
-        )
-        
-        assert pode_adicionar is False
+        assert pode_adicionar is esperado
     
     def test_multiplos_anexos_mesma_intercorrencia(self):
         """Testa criação de múltiplos anexos para a mesma intercorrência"""
@@ -1,6 +1,7 @@
+import uuid
+from functools import lru_cache
 import pytest
 from django.core.files.uploadedfile import SimpleUploadedFile
-from rest_framework.test import APIRequestFactory
 from anexos.models.anexo import Anexo
 from anexos.api.serializers.anexo_serializer import (
     AnexoSerializer,
@@ -10,13 +11,56 @@ from anexos.api.serializers.anexo_serializer import (
 from anexos.services import intercorrencia_service
 from anexos.services.intercorrencia_service import ExternalServiceError
 from anexos.tests.factories import (
-    AnexoFactory,
+    AnexoMetadadosFactory,
     AnexoPDFFactory,
     AnexoImagemFactory,
     AnexoDREFactory,
 )
 
 
+INTERCORRENCIA_UUID = uuid.UUID('123e4567-e89b-12d3-a456-426614174000')
+
+EXTENSOES_VALIDAS = ('jpeg', 'jpg', 'png', 'mp4', 'pdf', 'xlsx', 'docx', 'txt')
+
+CONTEUDO_ARQUIVO_FALSO = b'fake content'
+
+COMBINACOES_VALIDAS = (
+    (Anexo.PERFIL_DIRETOR, 'boletim_ocorrencia', '123e4567-e89b-12d3-a456-426614174001'),
+    (Anexo.PERFIL_DIRETOR, 'registro_ocorrencia_interno', '123e4567-e89b-12d3-a456-426614174002'),
+    (Anexo.PERFIL_ASSISTENTE, 'boletim_ocorrencia', '123e4567-e89b-12d3-a456-426614174003'),
+    (Anexo.PERFIL_DRE, 'boletim_ocorrencia', '123e4567-e89b-12d3-a456-426614174004'),
+    (Anexo.PERFIL_DRE, 'oficio', '123e4567-e89b-12d3-a456-426614174005'),
+    (Anexo.PERFIL_GIPE, 'boletim_ocorrencia', '123e4567-e89b-12d3-a456-426614174006'),
+    (Anexo.PERFIL_GIPE, 'oficio', '123e4567-e89b-12d3-a456-426614174007'),
+)
+
+
+def _fake_sized_upload(name, size, content_type):
+    """
+    Retorna um upload com conteúdo mínimo e `size` forçado.
+    As validações de tamanho leem apenas `size`, sem consumir o conteúdo.
+    """
+    arquivo = SimpleUploadedFile(name=name, content=b'x', content_type=content_type)
+    arquivo.size = size
+    return arquivo
+
+
+@lru_cache(maxsize=None)
+def _categorias_para(perfil):
+    """Categorias serializadas de um perfil (memoizadas; não alterar o retorno)"""
+    return CategoriasDisponiveisSerializer({'perfil': perfil}).data['categorias']
+
+
+@pytest.fixture(scope='module', autouse=True)
+def _aquecer_serializers():
+    """
+    Constrói os campos dos serializers uma vez antes dos testes do módulo,
+    tirando do primeiro teste o custo de imports tardios e metadados do modelo.
+    """
+    AnexoSerializer().fields
+    AnexoListSerializer().fields
+
+
 @pytest.mark.django_db
 class TestAnexoSerializer:
     """Testes do AnexoSerializer com dados mockados"""
@@ -48,7 +92,7 @@ class TestAnexoSerializer:
     def test_criacao_anexo_com_serializer(self, arquivo_pdf_mock):
         """Testa a criação de anexo através do serializer"""
         data = {
-            'intercorrencia_uuid': '123e4567-e89b-12d3-a456-426614174000',
+            'intercorrencia_uuid': INTERCORRENCIA_UUID,
             'perfil': Anexo.PERFIL_DIRETOR,
             'categoria': 'boletim_ocorrencia',
             'arquivo': arquivo_pdf_mock,
@@ -68,14 +112,14 @@ class TestAnexoSerializer:
     def test_validacao_arquivo_muito_grande(self):
         """Testa validação de arquivo maior que 10MB"""
         # Criar arquivo mock maior que 10MB
-        arquivo_grande = SimpleUploadedFile(
-            name='arquivo_grande.pdf',
-            content=b'x' * (11 * 1024 * 1024),  # 11MB
-            content_type='application/pdf'
+        arquivo_grande = _fake_sized_upload(
+            'arquivo_grande.pdf',
+            11 * 1024 * 1024,  # 11MB
+            'application/pdf'
         )
         
         data = {
-            'intercorrencia_uuid': '123e4567-e89b-12d3-a456-426614174000',
+            'intercorrencia_uuid': INTERCORRENCIA_UUID,
             'perfil': Anexo.PERFIL_DIRETOR,
             'categoria': 'boletim_ocorrencia',
             'arquivo': arquivo_grande,
@@ -85,7 +129,7 @@ class TestAnexoSerializer:
         assert not serializer.is_valid()
         
         assert 'detail' in serializer.errors
-        assert 'muito grande' in str(serializer.errors['detail']).lower()
+        assert 'muito grande' in serializer.errors['detail'].lower()
     
     def test_validacao_extensao_invalida(self):
         """Testa validação de extensão de arquivo não permitida"""
@@ -96,7 +140,7 @@ class TestAnexoSerializer:
         )
         
         data = {
-            'intercorrencia_uuid': '123e4567-e89b-12d3-a456-426614174000',
+            'intercorrencia_uuid': INTERCORRENCIA_UUID,
             'perfil': Anexo.PERFIL_DIRETOR,
             'categoria': 'boletim_ocorrencia',
             'arquivo': arquivo_invalido,
@@ -106,14 +150,14 @@ class TestAnexoSerializer:
         assert not serializer.is_valid()
         assert 'detail' in serializer.errors
         # Verificar se a mensagem contém informação sobre extensão
-        erro_msg = str(serializer.errors['detail']).lower()
+        erro_msg = serializer.errors['detail'].lower()
         assert 'exe' in erro_msg or 'extensão' in erro_msg or 'extension' in erro_msg
     
     def test_validacao_categoria_invalida_para_perfil(self, arquivo_pdf_mock):
         """Testa validação de categoria inválida para o perfil"""
         # Categoria de DRE para perfil Diretor (inválido)
         data = {
-            'intercorrencia_uuid': '123e4567-e89b-12d3-a456-426614174000',
+            'intercorrencia_uuid': INTERCORRENCIA_UUID,
             'perfil': Anexo.PERFIL_DIRETOR,
             'categoria': 'oficio',  # Categoria de DRE
             'arquivo': arquivo_pdf_mock,
@@ -122,13 +166,13 @@ class TestAnexoSerializer:
         serializer = AnexoSerializer(data=data)
         assert not serializer.is_valid()
         assert 'detail' in serializer.errors
-        assert 'não é válida' in str(serializer.errors['detail']).lower()
+        assert 'não é válida' in serializer.errors['detail'].lower()
 
     def test_validacao_categoria_valida_para_perfil(self, arquivo_pdf_mock):
         """Testa validação de categoria válida para o perfil"""
         # Categoria de Diretor para perfil Diretor (válido)
         data = {
-            'intercorrencia_uuid': '123e4567-e89b-12d3-a456-426614174000',
+            'intercorrencia_uuid': INTERCORRENCIA_UUID,
             'perfil': Anexo.PERFIL_DIRETOR,
             'categoria': 'boletim_ocorrencia',
             'arquivo': arquivo_pdf_mock,
@@ -139,19 +183,19 @@ class TestAnexoSerializer:
     
     def test_validacao_limite_tamanho_intercorrencia(self, arquivo_pdf_mock):
         """Testa validação do limite de 10MB por intercorrência"""
-        uuid_intercorrencia = '123e4567-e89b-12d3-a456-426614174000'
+        uuid_intercorrencia = INTERCORRENCIA_UUID
         
         # Criar anexo existente de 9MB
-        AnexoFactory(
+        AnexoMetadadosFactory(
             intercorrencia_uuid=uuid_intercorrencia,
             tamanho_bytes=9 * 1024 * 1024
         )
         
         # Tentar adicionar mais 2MB (ultrapassaria o limite)
-        arquivo_2mb = SimpleUploadedFile(
-            name='documento.pdf',
-            content=b'x' * (2 * 1024 * 1024),
-            content_type='application/pdf'
+        arquivo_2mb = _fake_sized_upload(
+            'documento.pdf',
+            2 * 1024 * 1024,
+            'application/pdf'
         )
         
         data = {
@@ -164,14 +208,14 @@ class TestAnexoSerializer:
         serializer = AnexoSerializer(data=data)
         assert not serializer.is_valid()
         assert 'detail' in serializer.errors
-        assert 'limite' in str(serializer.errors['detail']).lower()
+        assert 'limite' in serializer.errors['detail'].lower()
 
     def test_validacao_limite_tamanho_dentro_do_limite(self, arquivo_pdf_mock):
         """Testa que validação passa quando dentro do limite"""
-        uuid_intercorrencia = '123e4567-e89b-12d3-a456-426614174000'
+        uuid_intercorrencia = INTERCORRENCIA_UUID
         
         # Criar anexo existente de 5MB
-        AnexoFactory(
+        AnexoMetadadosFactory(
             intercorrencia_uuid=uuid_intercorrencia,
             tamanho_bytes=5 * 1024 * 1024
         )
@@ -190,7 +234,7 @@ class TestAnexoSerializer:
     def test_campos_read_only(self, arquivo_pdf_mock):
         """Testa que campos read-only não podem ser alterados"""
         data = {
-            'intercorrencia_uuid': '123e4567-e89b-12d3-a456-426614174000',
+            'intercorrencia_uuid': INTERCORRENCIA_UUID,
             'perfil': Anexo.PERFIL_DIRETOR,
             'categoria': 'boletim_ocorrencia',
             'arquivo': arquivo_pdf_mock,
@@ -213,13 +257,11 @@ class TestAnexoSerializer:
         assert anexo.tipo_mime == 'application/pdf'  # Do arquivo real
         assert anexo.ativo is True  # Padrão do modelo
     
-    def test_arquivo_url_com_request_context(self):
+    def test_arquivo_url_com_request_context(self, api_rf):
         """Testa geração de arquivo_url com request no contexto"""
         anexo = AnexoPDFFactory()
         
-        # Criar request factory mockado
-        factory = APIRequestFactory()
-        request = factory.get('/')
+        request = api_rf.get('/')
         
         serializer = AnexoSerializer(anexo, context={'request': request})
         data = serializer.data
@@ -238,51 +280,40 @@ class TestAnexoSerializer:
         
         assert data['arquivo_url'] is None
     
-    def test_extensoes_permitidas(self):
-        """Testa todas as extensões permitidas"""
-        extensoes_validas = ['jpeg', 'jpg', 'png', 'mp4', 'pdf', 'xlsx', 'docx', 'txt']
-        uuid_intercorrencia = '123e4567-e89b-12d3-a456-426614174000'
-        
-        for ext in extensoes_validas:
-            arquivo = SimpleUploadedFile(
-                name=f'arquivo.{ext}',
-                content=b'fake content',
-                content_type='application/octet-stream'
-            )
-            
-            data = {
-                'intercorrencia_uuid': uuid_intercorrencia,
-                'perfil': Anexo.PERFIL_DIRETOR,
-                'categoria': 'boletim_ocorrencia',
-                'arquivo': arquivo,
-            }
-            
-            serializer = AnexoSerializer(data=data)
-            assert serializer.is_valid(), f'Extensão {ext} deveria ser válida: {serializer.errors}'
+    @pytest.mark.parametrize('ext', EXTENSOES_VALIDAS)
+    def test_extensao_permitida(self, ext):
+        """Testa cada uma das extensões permitidas"""
+        arquivo = SimpleUploadedFile(
+            name=f'arquivo.{ext}',
+            content=CONTEUDO_ARQUIVO_FALSO,
+            content_type='application/octet-stream'
+        )
+        
+        data = {
+            'intercorrencia_uuid': INTERCORRENCIA_UUID,
+            'perfil': Anexo.PERFIL_DIRETOR,
+            'categoria': 'boletim_ocorrencia',
+            'arquivo': arquivo,
+        }
+        
+        serializer = AnexoSerializer(data=data)
+        assert serializer.is_valid(), f'Extensão {ext} deveria ser válida: {serializer.errors}'
     
-    def test_perfis_e_categorias_validas(self, arquivo_pdf_mock):
-        """Testa combinações válidas de perfis e categorias"""
-        combinacoes_validas = [
-            (Anexo.PERFIL_DIRETOR, 'boletim_ocorrencia', '123e4567-e89b-12d3-a456-426614174001'),
-            (Anexo.PERFIL_DIRETOR, 'registro_ocorrencia_interno', '123e4567-e89b-12d3-a456-426614174002'),
-            (Anexo.PERFIL_ASSISTENTE, 'boletim_ocorrencia', '123e4567-e89b-12d3-a456-426614174003'),
-            (Anexo.PERFIL_DRE, 'boletim_ocorrencia', '123e4567-e89b-12d3-a456-426614174004'),
-            (Anexo.PERFIL_DRE, 'oficio', '123e4567-e89b-12d3-a456-426614174005'),
-            (Anexo.PERFIL_GIPE, 'boletim_ocorrencia', '123e4567-e89b-12d3-a456-426614174006'),
-            (Anexo.PERFIL_GIPE, 'oficio', '123e4567-e89b-12d3-a456-426614174007'),
-        ]
+    @pytest.mark.parametrize('perfil,categoria,uuid_intercorrencia', COMBINACOES_VALIDAS)
+    def test_perfil_e_categoria_valida(
+        self, arquivo_pdf_mock, perfil, categoria, uuid_intercorrencia
+    ):
+        """Testa cada combinação válida de perfil e categoria"""
+        data = {
+            'intercorrencia_uuid': uuid_intercorrencia,
+            'perfil': perfil,
+            'categoria': categoria,
+            'arquivo': arquivo_pdf_mock,
+        }
         
-        for perfil, categoria, uuid_intercorrencia in combinacoes_validas:
-            data = {
-                'intercorrencia_uuid': uuid_intercorrencia,
-                'perfil': perfil,
-                'categoria': categoria,
-                'arquivo': arquivo_pdf_mock,
-            }
-            
-            serializer = AnexoSerializer(data=data)
-            assert serializer.is_valid(), \
-                f'Combinação {perfil}/{categoria} deveria ser válida: {serializer.errors}'
+        serializer = AnexoSerializer(data=data)
+        assert serializer.is_valid(), \
+            f'Combinação {perfil}/{categoria} deveria ser válida: {serializer.errors}'
 
 
 @pytest.mark.django_db
@@ -313,25 +344,25 @@ class TestAnexoListSerializer:
     
     def test_serializacao_multiplos_anexos(self):
         """Testa serialização de múltiplos anexos"""
-        anexos = [
-            AnexoPDFFactory(),
-            AnexoImagemFactory(),
-            AnexoDREFactory(),
-        ]
+        # Um único INSERT; arquivos referenciados apenas pelo nome
+        anexos = Anexo.objects.bulk_create([
+            AnexoPDFFactory.build(arquivo='anexos/documento.pdf'),
+            AnexoImagemFactory.build(arquivo='anexos/imagem.jpg'),
+            AnexoDREFactory.build(arquivo='anexos/relatorio.pdf'),
+        ])
         
         serializer = AnexoListSerializer(anexos, many=True)
         data = serializer.data
         
         assert len(data) == 3
-        assert all('uuid' in item for item in data)
-        assert all('nome_original' in item for item in data)
+        campos_obrigatorios = {'uuid', 'nome_original'}
+        assert all(campos_obrigatorios <= item.keys() for item in data)
     
-    def test_arquivo_url_com_request(self):
+    def test_arquivo_url_com_request(self, api_rf):
         """Testa geração de arquivo_url no list serializer"""
         anexo = AnexoPDFFactory()
         
-        factory = APIRequestFactory()
-        request = factory.get('/')
+        request = api_rf.get('/')
         
         serializer = AnexoListSerializer(anexo, context={'request': request})
         data = serializer.data
@@ -339,7 +370,6 @@ class TestAnexoListSerializer:
         assert 'arquivo_url' in data
 
 
-@pytest.mark.django_db
 class TestCategoriasDisponiveisSerializer:
     """Testes do CategoriasDisponiveisSerializer"""
     
@@ -352,9 +382,11 @@ class TestCategoriasDisponiveisSerializer:
         assert 'perfil' in data
         assert 'categorias' in data
         assert data['perfil'] == Anexo.PERFIL_DIRETOR
-        assert len(data['categorias']) == 4
-        assert all('value' in cat for cat in data['categorias'])
-        assert all('label' in cat for cat in data['categorias'])
+        
+        categorias = data['categorias']
+        assert len(categorias) == 4
+        assert all('value' in cat for cat in categorias)
+        assert all('label' in cat for cat in categorias)
     
     def test_serializacao_categorias_dre(self):
         """Testa serialização de categorias para perfil DRE"""
@@ -376,12 +408,8 @@ class TestCategoriasDisponiveisSerializer:
     
     def test_formato_categorias(self):
         """Testa o formato das categorias retornadas"""
-        data_input = {'perfil': Anexo.PERFIL_DIRETOR}
-        serializer = CategoriasDisponiveisSerializer(data_input)
-        data = serializer.data
-        
         # Verificar estrutura de cada categoria
-        for categoria in data['categorias']:
+        for categoria in _categorias_para(Anexo.PERFIL_DIRETOR):
             assert isinstance(categoria, dict)
             assert 'value' in categoria
             assert 'label' in categoria
@@ -392,14 +420,8 @@ class TestCategoriasDisponiveisSerializer:
     
     def test_categorias_assistente_igual_diretor(self):
         """Testa que Assistente tem as mesmas categorias que Diretor"""
-        data_diretor = {'perfil': Anexo.PERFIL_DIRETOR}
-        data_assistente = {'perfil': Anexo.PERFIL_ASSISTENTE}
-        
-        serializer_diretor = CategoriasDisponiveisSerializer(data_diretor)
-        serializer_assistente = CategoriasDisponiveisSerializer(data_assistente)
-        
-        categorias_diretor = serializer_diretor.data['categorias']
-        categorias_assistente = serializer_assistente.data['categorias']
+        categorias_diretor = _categorias_para(Anexo.PERFIL_DIRETOR)
+        categorias_assistente = _categorias_para(Anexo.PERFIL_ASSISTENTE)
         
         assert len(categorias_diretor) == len(categorias_assistente)
         
@@ -410,9 +432,8 @@ class TestCategoriasDisponiveisSerializer:
         assert values_diretor == values_assistente
 
 
-@pytest.mark.django_db
-class TestAnexoSerializerValidacoes:
-    """Testes específicos de validações do AnexoSerializer"""
+class TestAnexoSerializerValidacoesCampos:
+    """Validações de campo do AnexoSerializer que falham antes de acessar o banco"""
     
     def test_campos_obrigatorios(self):
         """Testa que campos obrigatórios são validados"""
@@ -422,7 +443,7 @@ class TestAnexoSerializerValidacoes:
         assert not serializer.is_valid()
         
         # Campos obrigatórios
-        erro_msg = str(serializer.errors['detail']).lower()
+        erro_msg = serializer.errors['detail'].lower()
         assert 'intercorrencia_uuid' in erro_msg
 
     
@@ -437,13 +458,13 @@ class TestAnexoSerializerValidacoes:
         
         serializer = AnexoSerializer(data=data)
         assert not serializer.is_valid()
-        erro_msg = str(serializer.errors['detail']).lower()
+        erro_msg = serializer.errors['detail'].lower()
         assert 'intercorrencia_uuid' in erro_msg
     
     def test_perfil_invalido(self, arquivo_pdf_mock):
         """Testa validação de perfil inválido"""
         data = {
-            'intercorrencia_uuid': '123e4567-e89b-12d3-a456-426614174000',
+            'intercorrencia_uuid': INTERCORRENCIA_UUID,
             'perfil': 'perfil_inexistente',
             'categoria': 'boletim_ocorrencia',
             'arquivo': arquivo_pdf_mock,
@@ -451,13 +472,18 @@ class TestAnexoSerializerValidacoes:
         
         serializer = AnexoSerializer(data=data)
         assert not serializer.is_valid()
-        erro_msg = str(serializer.errors['detail']).lower()
+        erro_msg = serializer.errors['detail'].lower()
         assert 'perfil' in erro_msg
+
+
+@pytest.mark.django_db
+class TestAnexoSerializerValidacoes:
+    """Testes específicos de validações do AnexoSerializer"""
     
     def test_criacao_preenche_metadados_automaticamente(self, arquivo_imagem_mock):
         """Testa que metadados do arquivo são preenchidos automaticamente"""
         data = {
-            'intercorrencia_uuid': '123e4567-e89b-12d3-a456-426614174000',
+            'intercorrencia_uuid': INTERCORRENCIA_UUID,
             'perfil': Anexo.PERFIL_DIRETOR,
             'categoria': 'boletim_ocorrencia',
             'arquivo': arquivo_imagem_mock,
@@ -476,14 +502,14 @@ class TestAnexoSerializerValidacoes:
     
     def test_validacao_tamanho_exato_limite(self):
         """Testa validação com arquivo exatamente no limite (10MB)"""
-        arquivo_10mb = SimpleUploadedFile(
-            name='documento.pdf',
-            content=b'x' * (10 * 1024 * 1024),  # Exatamente 10MB
-            content_type='application/pdf'
+        arquivo_10mb = _fake_sized_upload(
+            'documento.pdf',
+            10 * 1024 * 1024,  # Exatamente 10MB
+            'application/pdf'
         )
         
         data = {
-            'intercorrencia_uuid': '123e4567-e89b-12d3-a456-426614174000',
+            'intercorrencia_uuid': INTERCORRENCIA_UUID,
             'perfil': Anexo.PERFIL_DIRETOR,
             'categoria': 'boletim_ocorrencia',
             'arquivo': arquivo_10mb,
@@ -494,12 +520,11 @@ class TestAnexoSerializerValidacoes:
         assert serializer.is_valid(), serializer.errors
 
     def test_validacao_intercorrencia_com_token_chama_servico(
-        self, arquivo_pdf_mock, monkeypatch
+        self, arquivo_pdf_mock, monkeypatch, api_rf
     ):
         """Testa validação de intercorrência quando há token"""
-        factory = APIRequestFactory()
-        request = factory.post('/', HTTP_AUTHORIZATION='Bearer token-123')
-        uuid_intercorrencia = '123e4567-e89b-12d3-a456-426614174000'
+        request = api_rf.post('/', HTTP_AUTHORIZATION='Bearer token-123')
+        uuid_intercorrencia = INTERCORRENCIA_UUID
         called = {}
 
         def fake_get_detalhes(intercorrencia_uuid, token):
@@ -522,15 +547,14 @@ class TestAnexoSerializerValidacoes:
 
         serializer = AnexoSerializer(data=data, context={'request': request})
         assert serializer.is_valid(), serializer.errors
-        assert called["uuid"] == uuid_intercorrencia
+        assert called["uuid"] == str(uuid_intercorrencia)
         assert called["token"] == 'token-123'
 
     def test_validacao_intercorrencia_com_token_erro_servico(
-        self, arquivo_pdf_mock, monkeypatch
+        self, arquivo_pdf_mock, monkeypatch, api_rf
     ):
         """Testa erro do serviço externo ao validar intercorrência"""
-        factory = APIRequestFactory()
-        request = factory.post('/', HTTP_AUTHORIZATION='Bearer token-err')
+        request = api_rf.post('/', HTTP_AUTHORIZATION='Bearer token-err')
         uuid_intercorrencia = '123e4567-e89b-12d3-a456-426614174001'
 
         def fake_get_detalhes(*args, **kwargs):
@@ -552,4 +576,8 @@ class TestAnexoSerializerValidacoes:
         serializer = AnexoSerializer(data=data, context={'request': request})
         assert not serializer.is_valid()
         assert 'detail' in serializer.errors
-        assert 'falha no serviço externo' in str(serializer.errors['detail']).lower()
+        # Erro do serviço externo é propagado como lista de ErrorDetail
+        assert any(
+            'falha no serviço externo' in detalhe.lower()
+            for detalhe in serializer.errors['detail']
+        )
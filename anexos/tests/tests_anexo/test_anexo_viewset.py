@@ -11,112 +11,227 @@ from rest_framework.test import APIClient
 from django.contrib.auth import get_user_model
 import uuid
 import io
+import requests
+from functools import lru_cache
 
 from anexos.models.anexo import Anexo
+from anexos.tests.factories import AnexoDREFactory, AnexoPDFFactory
 
 User = get_user_model()
 
 
-@pytest.fixture
+@lru_cache(maxsize=256)
+def _url(nome, **kwargs):
+    """reverse() memoizado: cada rota/argumentos é resolvida uma única vez"""
+    return reverse(nome, kwargs=kwargs or None)
+
+
+@pytest.fixture(scope='session')
 def api_client():
-    """Cliente API para testes"""
+    """Cliente API para testes, compartilhado por toda a sessão"""
     return APIClient()
 
 
 @pytest.fixture
 def user():
     """Usuário autenticado para testes"""
-    user = User.objects.create_user(
-        username='testuser',
-        password='testpass123',
-        email='test@example.com'
-    )
+    user = User(username='testuser', email='test@example.com')
+    # Autenticação via force_authenticate: não é preciso gerar hash de senha
+    user.set_unusable_password()
+    user.save()
     return user
 
 
 @pytest.fixture
 def authenticated_client(api_client, user):
-    """Cliente autenticado"""
+    """Cliente autenticado; a autenticação é desfeita ao final de cada teste"""
     api_client.force_authenticate(user=user)
-    return api_client
+    yield api_client
+    api_client.force_authenticate(user=None)
+    api_client.credentials()
+    api_client.cookies.clear()
 
 
-@pytest.mark.django_db
-class TestAnexoViewSetList:
-    """Testes para listagem de anexos (GET /anexos/)"""
+@pytest.fixture
+def authenticated_client_no_db():
+    """
+    Cliente autenticado com um usuário não persistido, para endpoints que
+    respondem sem consultar o banco. Usa um cliente próprio porque desfazer
+    a autenticação do cliente compartilhado (logout) acessa a sessão no banco.
+    """
+    client = APIClient()
+    client.force_authenticate(user=User(username='testuser'))
+    return client
+
+
+# Conteúdo devolvido pelo MinIO mockado nos testes de download
+_FAKE_PDF_CHUNKS = (b'fake pdf content chunk 1', b'fake pdf content chunk 2')
+
+# Campos retornados para cada anexo pelos endpoints de URL de download
+_CAMPOS_URL_DOWNLOAD = frozenset({
+    'uuid', 'nome_arquivo', 'url_download', 'tamanho_bytes', 'categoria', 'perfil',
+})
+
+ANEXO_UUID_QUALQUER = uuid.UUID('0b7e4f7c-2d5a-4e8b-a1c3-9f6d2e8b4a10')
+INTERCORRENCIA_FILTRO_UUID = uuid.UUID('5f0c2a8e-3b1d-4c7a-9e2f-1a6b8d4c0e31')
+
+
+def _criar_anexos_pdf(quantidade, **kwargs):
+    """Cria anexos PDF com um único INSERT; arquivos referenciados apenas pelo nome"""
+    return Anexo.objects.bulk_create(
+        AnexoPDFFactory.build_batch(
+            quantidade, arquivo='anexos/documento.pdf', **kwargs
+        )
+    )
+
+
+@pytest.fixture
+def anexos_filtros_variados(db):
+    """
+    Anexos com intercorrência, perfil e categoria variados para os testes de filtro.
+    Criados na transação do teste (um único INSERT), desfeita ao final.
+    """
+    return Anexo.objects.bulk_create([
+        AnexoPDFFactory.build(
+            arquivo='anexos/documento.pdf',
+            intercorrencia_uuid=INTERCORRENCIA_FILTRO_UUID,
+            perfil=Anexo.PERFIL_DIRETOR,
+            categoria='boletim_ocorrencia',
+        ),
+        AnexoDREFactory.build(
+            arquivo='anexos/relatorio.pdf',
+            intercorrencia_uuid=INTERCORRENCIA_FILTRO_UUID,
+        ),
+        AnexoPDFFactory.build(
+            arquivo='anexos/registro.pdf',
+            perfil=Anexo.PERFIL_DIRETOR,
+            categoria='registro_ocorrencia_interno',
+        ),
+    ])
+
+
+@pytest.fixture
+def mock_minio_get(monkeypatch):
+    """Substitui o get da sessão HTTP usada pelo viewset para buscar arquivos no MinIO"""
+    from anexos.api.views import anexos_viewset
+
+    mock_get = Mock()
+    monkeypatch.setattr(anexos_viewset._session, 'get', mock_get)
+    return mock_get
+
+
+@pytest.fixture(scope='session')
+def minio_response_factory():
+    """Cria respostas mockadas do MinIO com os chunks informados"""
+    def _criar(chunks=_FAKE_PDF_CHUNKS, status_code=200):
+        response = Mock()
+        response.status_code = status_code
+        response.iter_content = Mock(return_value=chunks)
+        return response
+
+    return _criar
+
+
+@pytest.fixture
+def patched_perform_create(monkeypatch):
+    """
+    Substitui AnexoViewSet.perform_create para gravar um usuario_nome fixo.
+    Uso: patched_perform_create('Test User').
+    """
+    from anexos.api.views import anexos_viewset
+
+    def _aplicar(usuario_nome='Test User'):
+        def perform_create(self, serializer):
+            serializer.save(
+                usuario_username=self.request.user.username,
+                usuario_nome=usuario_nome
+            )
+
+        monkeypatch.setattr(
+            anexos_viewset.AnexoViewSet, 'perform_create', perform_create
+        )
+
+    return _aplicar
+
+
+@pytest.fixture
+def tres_anexos_mesma_intercorrencia(db, fast_uuid):
+    """
+    Três anexos PDF de uma mesma intercorrência.
+    Criados na transação do teste (um único INSERT), desfeita ao final.
+    """
+    return _criar_anexos_pdf(3, intercorrencia_uuid=fast_uuid())
+
+
+class TestAnexoViewSetAutenticacao:
+    """Testes de autenticação obrigatória nos endpoints de anexos"""
     
-    def test_list_anexos_sem_autenticacao(self, api_client):
-        """Testa que endpoint requer autenticação"""
-        url = reverse('anexo-list')
-        response = api_client.get(url)
+    @pytest.mark.parametrize('nome_url, kwargs, metodo', [
+        ('anexo-list', {}, 'get'),
+        ('anexo-list', {}, 'post'),
+        ('anexo-detail', {'uuid': ANEXO_UUID_QUALQUER}, 'get'),
+        ('anexo-detail', {'uuid': ANEXO_UUID_QUALQUER}, 'delete'),
+        ('anexo-por-intercorrencia', {'intercorrencia_uuid': ANEXO_UUID_QUALQUER}, 'get'),
+        ('anexo-categorias-disponiveis', {}, 'get'),
+        ('anexo-validar-limite', {}, 'post'),
+        ('anexo-url-download', {'uuid': ANEXO_UUID_QUALQUER}, 'get'),
+        ('anexo-url-download-todos', {'intercorrencia_uuid': ANEXO_UUID_QUALQUER}, 'get'),
+        ('anexo-download', {'uuid': ANEXO_UUID_QUALQUER}, 'get'),
+    ])
+    def test_endpoint_sem_autenticacao(self, api_client, nome_url, kwargs, metodo):
+        """Testa que o endpoint requer autenticação"""
+        url = _url(nome_url, **kwargs)
+        response = getattr(api_client, metodo)(url)
         
         assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+class TestAnexoViewSetList:
+    """Testes para listagem de anexos (GET /anexos/)"""
     
+    @pytest.mark.django_db
     def test_list_anexos_vazio(self, authenticated_client):
         """Testa listagem quando não há anexos"""
-        url = reverse('anexo-list')
+        url = _url('anexo-list')
         response = authenticated_client.get(url)
         
         assert response.status_code == status.HTTP_200_OK
         assert response.data['count'] == 0
         assert response.data['results'] == []
     
-    def test_list_anexos_com_dados(self, authenticated_client, anexo_pdf_factory):
+    @pytest.mark.django_db
+    def test_list_anexos_com_dados(self, authenticated_client):
         """Testa listagem com anexos existentes"""
         # Criar 3 anexos
-        anexo_pdf_factory.create_batch(3)
+        _criar_anexos_pdf(3)
         
-        url = reverse('anexo-list')
+        url = _url('anexo-list')
         response = authenticated_client.get(url)
         
         assert response.status_code == status.HTTP_200_OK
         assert response.data['count'] == 3
         assert len(response.data['results']) == 3
+
+
+@pytest.mark.django_db
+class TestAnexoViewSetListFiltros:
+    """Testes para os filtros da listagem de anexos (GET /anexos/?...)"""
     
-    def test_list_anexos_filtro_por_intercorrencia(
-        self, authenticated_client, anexo_pdf_factory
-    ):
-        """Testa filtro por intercorrencia_uuid"""
-        intercorrencia_uuid = uuid.uuid4()
-        
-        # Criar anexos da mesma intercorrência
-        anexo_pdf_factory.create_batch(2, intercorrencia_uuid=intercorrencia_uuid)
-        # Criar anexo de outra intercorrência
-        anexo_pdf_factory.create()
-        
-        url = reverse('anexo-list')
-        response = authenticated_client.get(url, {'intercorrencia_uuid': str(intercorrencia_uuid)})
-        
-        assert response.status_code == status.HTTP_200_OK
-        assert response.data['count'] == 2
-    
-    def test_list_anexos_filtro_por_perfil(
-        self, authenticated_client, anexo_pdf_factory, anexo_dre_factory
-    ):
-        """Testa filtro por perfil"""
-        # Criar anexos de diferentes perfis
-        anexo_pdf_factory.create_batch(2, perfil=Anexo.PERFIL_DIRETOR)
-        anexo_dre_factory.create_batch(1)  # Perfil DRE
-        
-        url = reverse('anexo-list')
-        response = authenticated_client.get(url, {'perfil': Anexo.PERFIL_DIRETOR})
-        
-        assert response.status_code == status.HTTP_200_OK
-        assert response.data['count'] == 2
-    
-    def test_list_anexos_filtro_por_categoria(
-        self, authenticated_client, anexo_pdf_factory
+    @pytest.mark.parametrize('filtros, quantidade_esperada', [
+        ({'intercorrencia_uuid': str(INTERCORRENCIA_FILTRO_UUID)}, 2),
+        ({'perfil': Anexo.PERFIL_DIRETOR}, 2),
+        ({'categoria': 'boletim_ocorrencia'}, 1),
+    ], ids=['intercorrencia', 'perfil', 'categoria'])
+    def test_list_anexos_filtrados(
+        self, authenticated_client, anexos_filtros_variados,
+        filtros, quantidade_esperada
     ):
-        """Testa filtro por categoria"""
-        # Criar anexos de diferentes categorias
-        anexo_pdf_factory.create(categoria='boletim_ocorrencia')
-        anexo_pdf_factory.create(categoria='registro_ocorrencia_interno')
-        
-        url = reverse('anexo-list')
-        response = authenticated_client.get(url, {'categoria': 'boletim_ocorrencia'})
+        """Testa filtros por intercorrencia_uuid, perfil e categoria"""
+        url = _url('anexo-list')
+        response = authenticated_client.get(url, filtros)
         
         assert response.status_code == status.HTTP_200_OK
-        assert response.data['count'] == 1
+        assert response.data['count'] == quantidade_esperada
 
 
 @pytest.mark.django_db
@@ -124,27 +239,16 @@ class TestAnexoViewSetCreate:
     """Testes para criação de anexos (POST /anexos/)"""
     
     def test_create_anexo_sucesso(
-        self, authenticated_client, user, arquivo_pdf_mock, monkeypatch
+        self, authenticated_client, user, arquivo_pdf_mock,
+        patched_perform_create, fast_uuid
     ):
         """Testa criação de anexo com sucesso"""
         # Mockar o perform_create para incluir usuario_nome
-        from anexos.api.views import anexos_viewset
+        patched_perform_create('Test User')
         
-        def mocked_perform_create(self, serializer):
-            serializer.save(
-                usuario_username=self.request.user.username,
-                usuario_nome='Test User'  # Valor fixo para teste
-            )
-        
-        monkeypatch.setattr(
-            anexos_viewset.AnexoViewSet,
-            'perform_create',
-            mocked_perform_create
-        )
-        
-        url = reverse('anexo-list')
+        url = _url('anexo-list')
         data = {
-            'intercorrencia_uuid': str(uuid.uuid4()),
+            'intercorrencia_uuid': str(fast_uuid()),
             'perfil': Anexo.PERFIL_DIRETOR,
             'categoria': 'boletim_ocorrencia',
             'arquivo': arquivo_pdf_mock,
@@ -158,11 +262,11 @@ class TestAnexoViewSetCreate:
         assert response.data['categoria'] == 'boletim_ocorrencia'
         assert response.data['usuario_username'] == user.username
     
-    def test_create_anexo_sem_arquivo(self, authenticated_client):
+    def test_create_anexo_sem_arquivo(self, authenticated_client, fast_uuid):
         """Testa criação sem arquivo (deve falhar)"""
-        url = reverse('anexo-list')
+        url = _url('anexo-list')
         data = {
-            'intercorrencia_uuid': str(uuid.uuid4()),
+            'intercorrencia_uuid': str(fast_uuid()),
             'perfil': Anexo.PERFIL_DIRETOR,
             'categoria': 'boletim_ocorrencia',
         }
@@ -173,12 +277,12 @@ class TestAnexoViewSetCreate:
         assert 'detail' in response.data
     
     def test_create_anexo_categoria_invalida_para_perfil(
-        self, authenticated_client, arquivo_pdf_mock
+        self, authenticated_client, arquivo_pdf_mock, fast_uuid
     ):
         """Testa criação com categoria inválida para o perfil"""
-        url = reverse('anexo-list')
+        url = _url('anexo-list')
         data = {
-            'intercorrencia_uuid': str(uuid.uuid4()),
+            'intercorrencia_uuid': str(fast_uuid()),
             'perfil': Anexo.PERFIL_DIRETOR,
             'categoria': 'relatorio_naapa',  # Categoria exclusiva de DRE
             'arquivo': arquivo_pdf_mock,
@@ -198,18 +302,18 @@ class TestAnexoViewSetRetrieve:
         """Testa recuperação de anexo por UUID"""
         anexo = anexo_pdf_factory.create()
         
-        url = reverse('anexo-detail', kwargs={'uuid': anexo.uuid})
+        url = _url('anexo-detail', uuid=anexo.uuid)
         response = authenticated_client.get(url)
         
         assert response.status_code == status.HTTP_200_OK
         assert response.data['uuid'] == str(anexo.uuid)
         assert response.data['nome_original'] == anexo.nome_original
     
-    def test_retrieve_anexo_nao_encontrado(self, authenticated_client):
+    def test_retrieve_anexo_nao_encontrado(self, authenticated_client, fast_uuid):
         """Testa recuperação de anexo inexistente"""
-        uuid_inexistente = uuid.uuid4()
+        uuid_inexistente = fast_uuid()
         
-        url = reverse('anexo-detail', kwargs={'uuid': uuid_inexistente})
+        url = _url('anexo-detail', uuid=uuid_inexistente)
         response = authenticated_client.get(url)
         
         assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -224,7 +328,7 @@ class TestAnexoViewSetDestroy:
         anexo = anexo_pdf_factory.create()
         anexo_uuid = anexo.uuid
         
-        url = reverse('anexo-detail', kwargs={'uuid': anexo_uuid})
+        url = _url('anexo-detail', uuid=anexo_uuid)
         response = authenticated_client.delete(url)
         
         assert response.status_code == status.HTTP_204_NO_CONTENT
@@ -232,11 +336,11 @@ class TestAnexoViewSetDestroy:
         # Verificar que foi excluído
         assert not Anexo.objects.filter(uuid=anexo_uuid).exists()
     
-    def test_destroy_anexo_nao_encontrado(self, authenticated_client):
+    def test_destroy_anexo_nao_encontrado(self, authenticated_client, fast_uuid):
         """Testa exclusão de anexo inexistente"""
-        uuid_inexistente = uuid.uuid4()
+        uuid_inexistente = fast_uuid()
         
-        url = reverse('anexo-detail', kwargs={'uuid': uuid_inexistente})
+        url = _url('anexo-detail', uuid=uuid_inexistente)
         response = authenticated_client.delete(url)
         
         assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -247,17 +351,15 @@ class TestAnexoViewSetPorIntercorrencia:
     """Testes para endpoint por_intercorrencia (GET /anexos/intercorrencia/{uuid}/)"""
     
     def test_por_intercorrencia_sucesso(
-        self, authenticated_client, anexo_pdf_factory
+        self, authenticated_client, tres_anexos_mesma_intercorrencia
     ):
         """Testa listagem de anexos por intercorrência"""
-        intercorrencia_uuid = uuid.uuid4()
+        intercorrencia_uuid = tres_anexos_mesma_intercorrencia[0].intercorrencia_uuid
         
-        # Criar 3 anexos da mesma intercorrência
-        anexo_pdf_factory.create_batch(3, intercorrencia_uuid=intercorrencia_uuid)
         # Criar 2 anexos de outra intercorrência
-        anexo_pdf_factory.create_batch(2)
+        _criar_anexos_pdf(2)
         
-        url = reverse('anexo-por-intercorrencia', kwargs={'intercorrencia_uuid': intercorrencia_uuid})
+        url = _url('anexo-por-intercorrencia', intercorrencia_uuid=intercorrencia_uuid)
         response = authenticated_client.get(url)
         
         assert response.status_code == status.HTTP_200_OK
@@ -265,11 +367,11 @@ class TestAnexoViewSetPorIntercorrencia:
         assert response.data['intercorrencia_uuid'] == str(intercorrencia_uuid)
         assert len(response.data['anexos']) == 3
     
-    def test_por_intercorrencia_vazio(self, authenticated_client):
+    def test_por_intercorrencia_vazio(self, authenticated_client, fast_uuid):
         """Testa listagem quando intercorrência não tem anexos"""
-        intercorrencia_uuid = uuid.uuid4()
+        intercorrencia_uuid = fast_uuid()
         
-        url = reverse('anexo-por-intercorrencia', kwargs={'intercorrencia_uuid': intercorrencia_uuid})
+        url = _url('anexo-por-intercorrencia', intercorrencia_uuid=intercorrencia_uuid)
         response = authenticated_client.get(url)
         
         assert response.status_code == status.HTTP_200_OK
@@ -277,14 +379,13 @@ class TestAnexoViewSetPorIntercorrencia:
         assert response.data['anexos'] == []
 
 
-@pytest.mark.django_db
 class TestAnexoViewSetCategoriasDisponiveis:
     """Testes para endpoint categorias_disponiveis"""
     
-    def test_categorias_disponiveis_diretor(self, authenticated_client):
+    def test_categorias_disponiveis_diretor(self, authenticated_client_no_db):
         """Testa categorias disponíveis para perfil diretor"""
-        url = reverse('anexo-categorias-disponiveis')
-        response = authenticated_client.get(url, {'perfil': Anexo.PERFIL_DIRETOR})
+        url = _url('anexo-categorias-disponiveis')
+        response = authenticated_client_no_db.get(url, {'perfil': Anexo.PERFIL_DIRETOR})
         
         assert response.status_code == status.HTTP_200_OK
         assert response.data['perfil'] == Anexo.PERFIL_DIRETOR
@@ -295,41 +396,41 @@ class TestAnexoViewSetCategoriasDisponiveis:
             assert 'value' in categoria
             assert 'label' in categoria
     
-    def test_categorias_disponiveis_dre(self, authenticated_client):
+    def test_categorias_disponiveis_dre(self, authenticated_client_no_db):
         """Testa categorias disponíveis para perfil DRE"""
-        url = reverse('anexo-categorias-disponiveis')
-        response = authenticated_client.get(url, {'perfil': Anexo.PERFIL_DRE})
+        url = _url('anexo-categorias-disponiveis')
+        response = authenticated_client_no_db.get(url, {'perfil': Anexo.PERFIL_DRE})
         
         assert response.status_code == status.HTTP_200_OK
         assert response.data['perfil'] == Anexo.PERFIL_DRE
         assert len(response.data['categorias']) > 0
     
-    def test_categorias_disponiveis_sem_perfil(self, authenticated_client):
+    def test_categorias_disponiveis_sem_perfil(self, authenticated_client_no_db):
         """Testa endpoint sem parâmetro perfil"""
-        url = reverse('anexo-categorias-disponiveis')
-        response = authenticated_client.get(url)
+        url = _url('anexo-categorias-disponiveis')
+        response = authenticated_client_no_db.get(url)
         
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert 'detail' in response.data
     
-    def test_categorias_disponiveis_perfil_invalido(self, authenticated_client):
+    def test_categorias_disponiveis_perfil_invalido(self, authenticated_client_no_db):
         """Testa endpoint com perfil inválido"""
-        url = reverse('anexo-categorias-disponiveis')
-        response = authenticated_client.get(url, {'perfil': 'invalido'})
+        url = _url('anexo-categorias-disponiveis')
+        response = authenticated_client_no_db.get(url, {'perfil': 'invalido'})
         
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert 'detail' in response.data
 
 
-@pytest.mark.django_db
 class TestAnexoViewSetValidarLimite:
     """Testes para endpoint validar_limite (POST /anexos/validar-limite/)"""
     
+    @pytest.mark.django_db
     def test_validar_limite_pode_adicionar(
-        self, authenticated_client, anexo_pdf_factory
+        self, authenticated_client, anexo_pdf_factory, fast_uuid
     ):
         """Testa validação quando pode adicionar arquivo"""
-        intercorrencia_uuid = uuid.uuid4()
+        intercorrencia_uuid = fast_uuid()
         
         # Criar anexo pequeno (1MB)
         anexo_pdf_factory.create(
@@ -337,7 +438,7 @@ class TestAnexoViewSetValidarLimite:
             tamanho_bytes=1024 * 1024  # 1MB
         )
         
-        url = reverse('anexo-validar-limite')
+        url = _url('anexo-validar-limite')
         data = {
             'intercorrencia_uuid': str(intercorrencia_uuid),
             'tamanho_bytes': 2 * 1024 * 1024  # 2MB
@@ -346,17 +447,19 @@ class TestAnexoViewSetValidarLimite:
         response = authenticated_client.post(url, data, format='json')
         
         assert response.status_code == status.HTTP_200_OK
-        assert response.data['pode_adicionar'] is True
-        assert abs(response.data['tamanho_atual_mb'] - 1.0) < 0.01
-        assert abs(response.data['tamanho_novo_arquivo_mb'] - 2.0) < 0.01
-        assert abs(response.data['tamanho_final_mb'] - 3.0) < 0.01
-        assert abs(response.data['limite_mb'] - 10.0) < 0.01
+        resultado = response.data
+        assert resultado['pode_adicionar'] is True
+        assert abs(resultado['tamanho_atual_mb'] - 1.0) < 0.01
+        assert abs(resultado['tamanho_novo_arquivo_mb'] - 2.0) < 0.01
+        assert abs(resultado['tamanho_final_mb'] - 3.0) < 0.01
+        assert abs(resultado['limite_mb'] - 10.0) < 0.01
     
+    @pytest.mark.django_db
     def test_validar_limite_ultrapassaria(
-        self, authenticated_client, anexo_pdf_factory
+        self, authenticated_client, anexo_pdf_factory, fast_uuid
     ):
         """Testa validação quando ultrapassaria o limite"""
-        intercorrencia_uuid = uuid.uuid4()
+        intercorrencia_uuid = fast_uuid()
         
         # Criar anexo de 8MB
         anexo_pdf_factory.create(
@@ -364,7 +467,7 @@ class TestAnexoViewSetValidarLimite:
             tamanho_bytes=8 * 1024 * 1024  # 8MB
         )
         
-        url = reverse('anexo-validar-limite')
+        url = _url('anexo-validar-limite')
         data = {
             'intercorrencia_uuid': str(intercorrencia_uuid),
             'tamanho_bytes': 3 * 1024 * 1024  # 3MB (total seria 11MB)
@@ -376,11 +479,11 @@ class TestAnexoViewSetValidarLimite:
         assert response.data['pode_adicionar'] is False
         assert 'ultrapassado' in response.data['mensagem'].lower()
     
-    def test_validar_limite_sem_parametros(self, authenticated_client):
+    def test_validar_limite_sem_parametros(self, authenticated_client_no_db):
         """Testa validação sem parâmetros obrigatórios"""
-        url = reverse('anexo-validar-limite')
+        url = _url('anexo-validar-limite')
         
-        response = authenticated_client.post(url, {}, format='json')
+        response = authenticated_client_no_db.post(url, {}, format='json')
         
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert 'detail' in response.data
@@ -394,29 +497,25 @@ class TestAnexoViewSetUrlDownload:
         """Testa geração de URL de download"""
         anexo = anexo_pdf_factory.create()
         
-        url = reverse('anexo-url-download', kwargs={'uuid': anexo.uuid})
+        url = _url('anexo-url-download', uuid=anexo.uuid)
         response = authenticated_client.get(url)
         
         assert response.status_code == status.HTTP_200_OK
+        resultado = response.data
         # Comparar como string pois DRF pode retornar UUID ou string dependendo do serializer
-        assert str(response.data['uuid']) == str(anexo.uuid)
-        assert response.data['nome_arquivo'] == anexo.nome_original
-        assert 'url_download' in response.data
-        assert response.data['expira_em'] == '1 hora'
-        assert 'tamanho_bytes' in response.data
-        assert 'categoria' in response.data
-        assert 'perfil' in response.data
+        assert _CAMPOS_URL_DOWNLOAD <= resultado.keys()
+        assert str(resultado['uuid']) == str(anexo.uuid)
+        assert resultado['nome_arquivo'] == anexo.nome_original
+        assert resultado['expira_em'] == '1 hora'
     
     def test_url_download_anexo_sem_arquivo(
         self, authenticated_client, anexo_pdf_factory
     ):
         """Testa geração de URL para anexo sem arquivo"""
-        anexo = anexo_pdf_factory.create()
-        # Remover arquivo
-        anexo.arquivo = None
-        anexo.save()
+        # Anexo já criado sem arquivo
+        anexo = anexo_pdf_factory.create(arquivo='')
         
-        url = reverse('anexo-url-download', kwargs={'uuid': anexo.uuid})
+        url = _url('anexo-url-download', uuid=anexo.uuid)
         response = authenticated_client.get(url)
         
         assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -428,44 +527,31 @@ class TestAnexoViewSetUrlDownloadTodos:
     """Testes para endpoint url_download_todos"""
     
     def test_url_download_todos_sucesso(
-        self, authenticated_client, anexo_pdf_factory
+        self, authenticated_client, tres_anexos_mesma_intercorrencia
     ):
         """Testa geração de URLs para todos os anexos"""
-        intercorrencia_uuid = uuid.uuid4()
-        
-        # Criar 3 anexos
-        anexo_pdf_factory.create_batch(3, intercorrencia_uuid=intercorrencia_uuid)
+        intercorrencia_uuid = tres_anexos_mesma_intercorrencia[0].intercorrencia_uuid
         
-        url = reverse(
-            'anexo-url-download-todos',
-            kwargs={'intercorrencia_uuid': intercorrencia_uuid}
-        )
+        url = _url('anexo-url-download-todos', intercorrencia_uuid=intercorrencia_uuid)
         response = authenticated_client.get(url)
         
         assert response.status_code == status.HTTP_200_OK
-        assert response.data['count'] == 3
-        assert response.data['total_anexos'] == 3
-        assert response.data['intercorrencia_uuid'] == str(intercorrencia_uuid)
-        assert len(response.data['anexos']) == 3
-        assert response.data['expira_em'] == '1 hora'
+        resultado = response.data
+        assert resultado['count'] == 3
+        assert resultado['total_anexos'] == 3
+        assert resultado['intercorrencia_uuid'] == str(intercorrencia_uuid)
+        assert len(resultado['anexos']) == 3
+        assert resultado['expira_em'] == '1 hora'
         
         # Verificar estrutura de cada anexo
-        for anexo_data in response.data['anexos']:
-            assert 'uuid' in anexo_data
-            assert 'nome_arquivo' in anexo_data
-            assert 'url_download' in anexo_data
-            assert 'tamanho_bytes' in anexo_data
-            assert 'categoria' in anexo_data
-            assert 'perfil' in anexo_data
-    
-    def test_url_download_todos_sem_anexos(self, authenticated_client):
+        for anexo_data in resultado['anexos']:
+            assert _CAMPOS_URL_DOWNLOAD <= anexo_data.keys()
+    
+    def test_url_download_todos_sem_anexos(self, authenticated_client, fast_uuid):
         """Testa endpoint quando não há anexos"""
-        intercorrencia_uuid = uuid.uuid4()
+        intercorrencia_uuid = fast_uuid()
         
-        url = reverse(
-            'anexo-url-download-todos',
-            kwargs={'intercorrencia_uuid': intercorrencia_uuid}
-        )
+        url = _url('anexo-url-download-todos', intercorrencia_uuid=intercorrencia_uuid)
         response = authenticated_client.get(url)
         
         assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -473,10 +559,10 @@ class TestAnexoViewSetUrlDownloadTodos:
         assert response.data['anexos'] == []
     
     def test_url_download_todos_com_diferentes_perfis(
-        self, authenticated_client, anexo_pdf_factory, anexo_dre_factory
+        self, authenticated_client, anexo_pdf_factory, anexo_dre_factory, fast_uuid
     ):
         """Testa URLs com anexos de diferentes perfis"""
-        intercorrencia_uuid = uuid.uuid4()
+        intercorrencia_uuid = fast_uuid()
         
         # Criar anexos de diferentes perfis
         anexo_pdf_factory.create(
@@ -485,10 +571,7 @@ class TestAnexoViewSetUrlDownloadTodos:
         )
         anexo_dre_factory.create(intercorrencia_uuid=intercorrencia_uuid)
         
-        url = reverse(
-            'anexo-url-download-todos',
-            kwargs={'intercorrencia_uuid': intercorrencia_uuid}
-        )
+        url = _url('anexo-url-download-todos', intercorrencia_uuid=intercorrencia_uuid)
         response = authenticated_client.get(url)
         
         assert response.status_code == status.HTTP_200_OK
@@ -499,26 +582,22 @@ class TestAnexoViewSetUrlDownloadTodos:
         assert len(perfis) == 2
 
 
+@pytest.mark.slow
 @pytest.mark.django_db
 class TestAnexoViewSetDownload:
     """Testes para endpoint download (GET /anexos/{uuid}/download/)"""
     
-    @patch('anexos.api.views.anexos_viewset.requests.get')
     def test_download_sucesso(
-        self, mock_requests_get, authenticated_client, anexo_pdf_factory
+        self, mock_minio_get, minio_response_factory,
+        authenticated_client, anexo_pdf_factory
     ):
         """Testa download de arquivo com sucesso"""
         anexo = anexo_pdf_factory.create()
         
         # Mockar resposta do MinIO
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.iter_content = Mock(
-            return_value=[b'fake pdf content chunk 1', b'fake pdf content chunk 2']
-        )
-        mock_requests_get.return_value = mock_response
+        mock_minio_get.return_value = minio_response_factory()
         
-        url = reverse('anexo-download', kwargs={'uuid': anexo.uuid})
+        url = _url('anexo-download', uuid=anexo.uuid)
         response = authenticated_client.get(url)
         
         assert response.status_code == status.HTTP_200_OK
@@ -526,20 +605,17 @@ class TestAnexoViewSetDownload:
         assert anexo.nome_original in response['Content-Disposition']
         assert response['Content-Type'] == anexo.tipo_mime
     
-    @patch('anexos.api.views.anexos_viewset.requests.get')
     def test_download_inline(
-        self, mock_requests_get, authenticated_client, anexo_pdf_factory
+        self, mock_minio_get, minio_response_factory,
+        authenticated_client, anexo_pdf_factory
     ):
         """Testa download com visualização inline"""
         anexo = anexo_pdf_factory.create()
         
         # Mockar resposta do MinIO
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.iter_content = Mock(return_value=[b'fake pdf content'])
-        mock_requests_get.return_value = mock_response
+        mock_minio_get.return_value = minio_response_factory()
         
-        url = reverse('anexo-download', kwargs={'uuid': anexo.uuid})
+        url = _url('anexo-download', uuid=anexo.uuid)
         response = authenticated_client.get(url, {'inline': 'true'})
         
         assert response.status_code == status.HTTP_200_OK
@@ -549,30 +625,65 @@ class TestAnexoViewSetDownload:
         self, authenticated_client, anexo_pdf_factory
     ):
         """Testa download de anexo sem arquivo"""
-        anexo = anexo_pdf_factory.create()
-        anexo.arquivo = None
-        anexo.save()
+        anexo = anexo_pdf_factory.create(arquivo='')
         
-        url = reverse('anexo-download', kwargs={'uuid': anexo.uuid})
+        url = _url('anexo-download', uuid=anexo.uuid)
         response = authenticated_client.get(url)
         
         assert response.status_code == status.HTTP_404_NOT_FOUND
     
-    @patch('anexos.api.views.anexos_viewset.requests.get')
     def test_download_erro_minio(
-        self, mock_requests_get, authenticated_client, anexo_pdf_factory
+        self, mock_minio_get, authenticated_client, anexo_pdf_factory
     ):
         """Testa erro ao buscar arquivo do MinIO"""
         anexo = anexo_pdf_factory.create()
         
         # Simular erro do MinIO
-        mock_requests_get.side_effect = Exception('MinIO connection error')
+        mock_minio_get.side_effect = Exception('MinIO connection error')
         
-        url = reverse('anexo-download', kwargs={'uuid': anexo.uuid})
+        url = _url('anexo-download', uuid=anexo.uuid)
         response = authenticated_client.get(url)
         
         assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
         assert 'detail' in response.data
+    
+    def test_download_erro_http_minio_fecha_resposta(
+        self, mock_minio_get, minio_response_factory,
+        authenticated_client, anexo_pdf_factory
+    ):
+        """Testa que a resposta do MinIO é fechada quando ele devolve 404"""
+        anexo = anexo_pdf_factory.create()
+        
+        minio_response = minio_response_factory(status_code=404)
+        minio_response.raise_for_status.side_effect = requests.HTTPError('404 Not Found')
+        mock_minio_get.return_value = minio_response
+        
+        url = _url('anexo-download', uuid=anexo.uuid)
+        response = authenticated_client.get(url)
+        
+        assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+        minio_response.close.assert_called_once()
+    
+    @pytest.mark.parametrize('consumir', [True, False], ids=['stream_completo', 'encerrado_antes'])
+    def test_download_fecha_resposta_minio_ao_encerrar(
+        self, mock_minio_get, minio_response_factory,
+        authenticated_client, anexo_pdf_factory, consumir
+    ):
+        """Testa que a resposta do MinIO é fechada ao fim do streaming ou no encerramento antecipado"""
+        anexo = anexo_pdf_factory.create()
+        
+        minio_response = minio_response_factory()
+        mock_minio_get.return_value = minio_response
+        
+        url = _url('anexo-download', uuid=anexo.uuid)
+        response = authenticated_client.get(url)
+        
+        minio_response.close.assert_not_called()
+        if consumir:
+            assert b''.join(response.streaming_content) == b''.join(_FAKE_PDF_CHUNKS)
+        response.close()
+        
+        minio_response.close.assert_called()
 
 
 @pytest.mark.django_db
@@ -591,62 +702,56 @@ class TestAnexoViewSetExtraCoverage:
         assert serializer_class is not None
     
     def test_perform_create_user_sem_nome(
-        self, authenticated_client, arquivo_pdf_mock
+        self, authenticated_client, arquivo_pdf_mock,
+        patched_perform_create, fast_uuid
     ):
         """Testa perform_create quando usuário não tem atributo 'name'"""
         # Criar user sem campo 'name'
-        user_sem_nome = User.objects.create_user(
-            username='user_sem_nome',
-            password='testpass123',
-            email='sem_nome@example.com'
-        )
+        user_sem_nome = User(username='user_sem_nome', email='sem_nome@example.com')
+        user_sem_nome.set_unusable_password()
+        user_sem_nome.save()
         
         # Mockar perform_create para usar string vazia em vez de None
-        from anexos.api.views import anexos_viewset
+        patched_perform_create('')
         
-        def mocked_perform_create(self, serializer):
-            user = self.request.user
-            usuario_nome = getattr(user, 'name', None) or ''  # String vazia se None
-            serializer.save(
-                usuario_username=user.username,
-                usuario_nome=usuario_nome
-            )
+        # Force authenticate com user sem nome
+        authenticated_client.force_authenticate(user=user_sem_nome)
         
-        with patch.object(anexos_viewset.AnexoViewSet, 'perform_create', mocked_perform_create):
-            # Force authenticate com user sem nome
-            authenticated_client.force_authenticate(user=user_sem_nome)
-            
-            url = reverse('anexo-list')
-            data = {
-                'intercorrencia_uuid': str(uuid.uuid4()),
-                'perfil': Anexo.PERFIL_DIRETOR,
-                'categoria': 'boletim_ocorrencia',
-                'arquivo': arquivo_pdf_mock,
-            }
-            
-            response = authenticated_client.post(url, data, format='multipart')
-            
-            # Deve criar com sucesso
-            assert response.status_code == status.HTTP_201_CREATED
-            assert response.data['usuario_username'] == 'user_sem_nome'
+        url = _url('anexo-list')
+        data = {
+            'intercorrencia_uuid': str(fast_uuid()),
+            'perfil': Anexo.PERFIL_DIRETOR,
+            'categoria': 'boletim_ocorrencia',
+            'arquivo': arquivo_pdf_mock,
+        }
+        
+        response = authenticated_client.post(url, data, format='multipart')
+        
+        # Deve criar com sucesso
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['usuario_username'] == 'user_sem_nome'
     
-    @patch('anexos.models.anexo.Anexo.delete')
+    @pytest.mark.slow
     def test_destroy_erro_ao_excluir_arquivo(
-        self, mock_delete, authenticated_client, anexo_pdf_factory
+        self, authenticated_client, anexo_pdf_factory, monkeypatch
     ):
         """Testa destroy quando ocorre erro ao excluir arquivo do storage"""
         anexo = anexo_pdf_factory.create()
         
         # Simular erro ao deletar arquivo
-        mock_delete.side_effect = Exception('Erro ao excluir arquivo do MinIO')
+        def delete_com_erro(self, *args, **kwargs):
+            raise Exception('Erro ao excluir arquivo do MinIO')
         
-        url = reverse('anexo-detail', kwargs={'uuid': anexo.uuid})
+        monkeypatch.setattr(Anexo, 'delete', delete_com_erro)
+        
+        url = _url('anexo-detail', uuid=anexo.uuid)
         response = authenticated_client.delete(url)
         
         # Deve retornar erro 500
         assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
         assert 'detail' in response.data
     
+    @pytest.mark.slow
     def test_destroy_erro_ao_buscar_anexo(self, authenticated_client, anexo_pdf_factory):
         """Testa destroy quando ocorre erro ao buscar anexo para deletar"""
         # Criar anexo válido
@@ -654,7 +759,7 @@ class TestAnexoViewSetExtraCoverage:
         
         # Mockar o delete do anexo para simular erro
         with patch.object(anexo, 'delete', side_effect=Exception('Database connection error')):
-            url = reverse('anexo-detail', kwargs={'uuid': anexo.uuid})
+            url = _url('anexo-detail', uuid=anexo.uuid)
             
             # Precisamos mockar get_object também para retornar nosso anexo mockado
             with patch('anexos.api.views.anexos_viewset.AnexoViewSet.get_object', return_value=anexo):
@@ -663,19 +768,19 @@ class TestAnexoViewSetExtraCoverage:
                 # Deve retornar erro 500
                 assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
     
-    @patch('anexos.api.views.anexos_viewset.requests.get')
+    @pytest.mark.slow
     def test_download_request_exception(
-        self, mock_requests_get, authenticated_client, anexo_pdf_factory
+        self, mock_minio_get, authenticated_client, anexo_pdf_factory
     ):
-        """Testa download quando requests.get lança RequestException"""
+        """Testa download quando a requisição ao MinIO lança RequestException"""
         import requests
         
         anexo = anexo_pdf_factory.create()
         
         # Simular RequestException
-        mock_requests_get.side_effect = requests.RequestException('Connection timeout')
+        mock_minio_get.side_effect = requests.RequestException('Connection timeout')
         
-        url = reverse('anexo-download', kwargs={'uuid': anexo.uuid})
+        url = _url('anexo-download', uuid=anexo.uuid)
         response = authenticated_client.get(url)
         
         # Deve retornar erro 500
@@ -683,25 +788,21 @@ class TestAnexoViewSetExtraCoverage:
         assert 'detail' in response.data
     
     def test_url_download_todos_com_anexo_sem_arquivo(
-        self, authenticated_client, anexo_pdf_factory
+        self, authenticated_client, anexo_pdf_factory, fast_uuid
     ):
         """Testa url_download_todos quando algum anexo não tem arquivo (chave 'erros')"""
-        intercorrencia_uuid = uuid.uuid4()
+        intercorrencia_uuid = fast_uuid()
         
         # Criar anexo com arquivo
         anexo_pdf_factory.create(intercorrencia_uuid=intercorrencia_uuid)
         
         # Criar anexo sem arquivo
         anexo_sem_arquivo = anexo_pdf_factory.create(
-            intercorrencia_uuid=intercorrencia_uuid
+            intercorrencia_uuid=intercorrencia_uuid,
+            arquivo=''
         )
-        anexo_sem_arquivo.arquivo = None
-        anexo_sem_arquivo.save()
         
-        url = reverse(
-            'anexo-url-download-todos',
-            kwargs={'intercorrencia_uuid': intercorrencia_uuid}
-        )
+        url = _url('anexo-url-download-todos', intercorrencia_uuid=intercorrencia_uuid)
         response = authenticated_client.get(url)
         
         assert response.status_code == status.HTTP_200_OK
@@ -722,7 +823,7 @@ class TestAnexoViewSetExtraCoverage:
         """Testa que logger.info é chamado ao excluir anexo com sucesso"""
         anexo = anexo_pdf_factory.create()
         
-        url = reverse('anexo-detail', kwargs={'uuid': anexo.uuid})
+        url = _url('anexo-detail', uuid=anexo.uuid)
         response = authenticated_client.delete(url)
         
         assert response.status_code == status.HTTP_204_NO_CONTENT
@@ -733,17 +834,19 @@ class TestAnexoViewSetExtraCoverage:
         assert 'excluído' in call_args.lower() or 'deletado' in call_args.lower()
     
     @patch('anexos.api.views.anexos_viewset.logger')
-    @patch('anexos.models.anexo.Anexo.delete')
     def test_destroy_logging_on_error(
-        self, mock_delete, mock_logger, authenticated_client, anexo_pdf_factory
+        self, mock_logger, authenticated_client, anexo_pdf_factory, monkeypatch
     ):
         """Testa que logger.error é chamado ao ocorrer erro na exclusão"""
         anexo = anexo_pdf_factory.create()
         
         # Simular erro
-        mock_delete.side_effect = Exception('Erro ao excluir')
+        def delete_com_erro(self, *args, **kwargs):
+            raise Exception('Erro ao excluir')
         
-        url = reverse('anexo-detail', kwargs={'uuid': anexo.uuid})
+        monkeypatch.setattr(Anexo, 'delete', delete_com_erro)
+        
+        url = _url('anexo-detail', uuid=anexo.uuid)
         response = authenticated_client.delete(url)
         
         assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -751,10 +854,10 @@ class TestAnexoViewSetExtraCoverage:
         # Verificar que logger.error foi chamado
         assert mock_logger.error.called
     
+    @pytest.mark.slow
     @patch('anexos.api.views.anexos_viewset.logger')
-    @patch('anexos.api.views.anexos_viewset.requests.get')
     def test_download_logging_on_request_exception(
-        self, mock_requests_get, mock_logger, authenticated_client, anexo_pdf_factory
+        self, mock_logger, mock_minio_get, authenticated_client, anexo_pdf_factory
     ):
         """Testa que logger.error é chamado quando RequestException ocorre no download"""
         import requests
@@ -762,9 +865,9 @@ class TestAnexoViewSetExtraCoverage:
         anexo = anexo_pdf_factory.create()
         
         # Simular RequestException
-        mock_requests_get.side_effect = requests.RequestException('Connection error')
+        mock_minio_get.side_effect = requests.RequestException('Connection error')
         
-        url = reverse('anexo-download', kwargs={'uuid': anexo.uuid})
+        url = _url('anexo-download', uuid=anexo.uuid)
         response = authenticated_client.get(url)
         
         assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -783,7 +886,7 @@ class TestAnexoViewSetExtraCoverage:
         anexo_factory.create_batch(3, perfil=Anexo.PERFIL_ASSISTENTE)
         anexo_factory.create_batch(1, perfil=Anexo.PERFIL_DRE)  # Não deve entrar
 
-        url = reverse('anexo-list')
+        url = _url('anexo-list')
 
         # Act
         response = authenticated_client.get(url, {'perfil': 'UE'})
@@ -806,7 +909,7 @@ class TestAnexoViewSetExtraCoverage:
         # Arrange
         anexo_factory.create_batch(2, perfil=Anexo.PERFIL_DRE)
 
-        url = reverse('anexo-list')
+        url = _url('anexo-list')
 
         # Act
         response = authenticated_client.get(url, {'perfil': 'UE'})
@@ -836,7 +939,7 @@ class TestAnexoViewSetExtraCoverage:
             categoria='boletim_ocorrencia',
         )
 
-        url = reverse('anexo-list')
+        url = _url('anexo-list')
 
         # Act
         response = authenticated_client.get(
@@ -864,7 +967,7 @@ class TestAnexoViewSetDeletarPorIntercorrencia:
     ):
         """Testa que sem token interno retorna 403"""
         settings.INTERNAL_SERVICE_TOKEN = "segredo"
-        url = reverse('anexo-deletar-por-intercorrencia')
+        url = _url('anexo-deletar-por-intercorrencia')
 
         response = api_client.post(url, {}, format='json')
 
@@ -875,7 +978,7 @@ class TestAnexoViewSetDeletarPorIntercorrencia:
     ):
         """Testa validação de payload obrigatório"""
         settings.INTERNAL_SERVICE_TOKEN = "segredo"
-        url = reverse('anexo-deletar-por-intercorrencia')
+        url = _url('anexo-deletar-por-intercorrencia')
 
         response = api_client.post(url, {}, format='json', **self._auth_headers("segredo"))
 
@@ -887,7 +990,7 @@ class TestAnexoViewSetDeletarPorIntercorrencia:
     ):
         """Testa validação de UUID inválido"""
         settings.INTERNAL_SERVICE_TOKEN = "segredo"
-        url = reverse('anexo-deletar-por-intercorrencia')
+        url = _url('anexo-deletar-por-intercorrencia')
 
         response = api_client.post(
             url,
@@ -900,12 +1003,12 @@ class TestAnexoViewSetDeletarPorIntercorrencia:
         assert 'inválido' in response.data['detail'].lower()
 
     def test_deletar_por_intercorrencia_sem_anexos(
-        self, api_client, settings
+        self, api_client, settings, fast_uuid
     ):
         """Testa resposta quando não há anexos"""
         settings.INTERNAL_SERVICE_TOKEN = "segredo"
-        intercorrencia_uuid = uuid.uuid4()
-        url = reverse('anexo-deletar-por-intercorrencia')
+        intercorrencia_uuid = fast_uuid()
+        url = _url('anexo-deletar-por-intercorrencia')
 
         response = api_client.post(
             url,
@@ -919,15 +1022,15 @@ class TestAnexoViewSetDeletarPorIntercorrencia:
         assert response.data['detalhes'] == []
 
     def test_deletar_por_intercorrencia_sucesso(
-        self, api_client, settings, anexo_pdf_factory
+        self, api_client, settings, anexo_pdf_factory, fast_uuid
     ):
         """Testa exclusão de anexos com sucesso"""
         settings.INTERNAL_SERVICE_TOKEN = "segredo"
-        intercorrencia_uuid = uuid.uuid4()
+        intercorrencia_uuid = fast_uuid()
         anexos = anexo_pdf_factory.create_batch(
             2, intercorrencia_uuid=intercorrencia_uuid
         )
-        url = reverse('anexo-deletar-por-intercorrencia')
+        url = _url('anexo-deletar-por-intercorrencia')
 
         response = api_client.post(
             url,
@@ -943,15 +1046,15 @@ class TestAnexoViewSetDeletarPorIntercorrencia:
             assert not Anexo.objects.filter(uuid=anexo.uuid).exists()
 
     def test_deletar_por_intercorrencia_rollback_em_erro(
-        self, api_client, settings, anexo_pdf_factory
+        self, api_client, settings, anexo_pdf_factory, fast_uuid
     ):
         """Testa rollback quando ocorre erro durante a exclusão"""
         settings.INTERNAL_SERVICE_TOKEN = "segredo"
-        intercorrencia_uuid = uuid.uuid4()
+        intercorrencia_uuid = fast_uuid()
         anexos = anexo_pdf_factory.create_batch(
             2, intercorrencia_uuid=intercorrencia_uuid
         )
-        url = reverse('anexo-deletar-por-intercorrencia')
+        url = _url('anexo-deletar-por-intercorrencia')
 
         original_delete = Anexo.delete
         calls = {"n": 0}
@@ -975,15 +1078,15 @@ class TestAnexoViewSetDeletarPorIntercorrencia:
             assert Anexo.objects.filter(uuid=anexo.uuid).exists()
 
     def test_deletar_por_intercorrencia_erro_ao_excluir_arquivo_minio(
-        self, api_client, settings, anexo_pdf_factory
+        self, api_client, settings, anexo_pdf_factory, fast_uuid
     ):
         """Testa erro ao excluir arquivo físico do MinIO (IOError)"""
         settings.INTERNAL_SERVICE_TOKEN = "segredo"
-        intercorrencia_uuid = uuid.uuid4()
+        intercorrencia_uuid = fast_uuid()
         anexos = anexo_pdf_factory.create_batch(
             2, intercorrencia_uuid=intercorrencia_uuid
         )
-        url = reverse('anexo-deletar-por-intercorrencia')
+        url = _url('anexo-deletar-por-intercorrencia')
 
         calls = {"n": 0}
 
@@ -5,7 +5,7 @@ from datetime import datetime, timedelta, timezone
 import jwt
 import pytest
 import requests
-from django.core.cache import cache
+import time_machine
 from django.test.client import RequestFactory
 from rest_framework.exceptions import AuthenticationFailed
 
@@ -14,13 +14,6 @@ def _auth_header(token: str) -> dict:
     return {"HTTP_AUTHORIZATION": f"Bearer {token}"}
 
 
-@pytest.fixture(autouse=True)
-def _clear_cache():
-    cache.clear()
-    yield
-    cache.clear()
-
-
 @pytest.fixture
 def rf():
     return RequestFactory()
@@ -107,6 +100,7 @@ def test_fluxo_feliz_sub_quando_sem_username(settings, rf, monkeypatch):
 
 
 @pytest.mark.django_db
+@time_machine.travel(datetime(2025, 1, 1, tzinfo=timezone.utc), tick=False)
 def test_cache_evita_segunda_chamada_ao_verificador(settings, rf, monkeypatch):
     settings.AUTH_VERIFY_URL = "http://auth/verify/"
     settings.SECRET_KEY = "super-secret"
@@ -3,296 +3,320 @@ Testes adicionais para anexos.auth
 
 Cobre branches de erro, caching e parsing de dados do usuário.
 """
+from datetime import datetime, timezone
+
 import pytest
-from unittest.mock import Mock, patch, MagicMock
 import requests
+import time_machine
 import jwt
-import time
+from types import SimpleNamespace
 from rest_framework.exceptions import AuthenticationFailed
-from django.core.cache import cache
 
+import anexos.auth as auth_module
 from anexos.auth import RemoteJWTAuthentication, ExternalUser
 
+# Testes unitários puros (sem banco): podem rodar isolados com -m unit
+pytestmark = pytest.mark.unit
+
+
+# Exceções usadas nos stubs, resolvidas uma única vez
+_PyJWTError = jwt.PyJWTError
+_RequestException = requests.RequestException
+
+# Relógio congelado nos testes de cache: TTL calculado a partir do exp é sempre o mesmo
+_AGORA = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+# exp fixo e distante no futuro (ano 2286): payloads determinísticos e reaproveitáveis
+_FUTURE_EXP = 10_000_000_000
+
+_PAYLOAD_USERNAME = {'username': 'testuser', 'exp': _FUTURE_EXP}
+_PAYLOAD_COMPLETO = {
+    'username': 'testuser',
+    'name': 'Test User',
+    'perfil_codigo': 123,
+    'exp': _FUTURE_EXP,
+}
+# Sem username, sub ou user_id
+_PAYLOAD_SEM_USERNAME = {'exp': _FUTURE_EXP}
+_PAYLOAD_SUB = {'sub': 'user_from_sub', 'exp': _FUTURE_EXP}
+
+
+class _FakeResp:
+    """Resposta HTTP mínima: apenas status_code e json()"""
+    __slots__ = ('status_code', '_json')
+
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self._json = payload
+
+    def json(self):
+        return self._json
+
+
+# Respostas do serviço de autenticação, construídas uma única vez
+_RESP_200 = _FakeResp(200)
+_RESP_200_USER = _FakeResp(200, {'name': 'Test User', 'cargo_codigo': 123})
+_RESP_401 = _FakeResp(401)
+_RESP_404 = _FakeResp(404)
+
+
+class _FakeHTTP:
+    """
+    Registro mínimo (método, URL) -> resposta para requests.get/post.
+    Uma resposta que seja exceção é lançada no lugar de retornada.
+    """
+
+    def __init__(self):
+        self._rotas = {}
+        self.chamadas = []
+
+    def registrar(self, metodo, url, resposta):
+        self._rotas[(metodo, url)] = resposta
+
+    def despachar(self, metodo, url):
+        self.chamadas.append((metodo, url))
+        resposta = self._rotas[(metodo, url)]
+        if isinstance(resposta, BaseException):
+            raise resposta
+        return resposta
+
+    @property
+    def call_count(self):
+        return len(self.chamadas)
+
+
+@pytest.fixture
+def fake_http(monkeypatch):
+    """Direciona requests.post/get do serviço de auth para um _FakeHTTP"""
+    http = _FakeHTTP()
+    monkeypatch.setattr(requests, 'post', lambda url, **kwargs: http.despachar('POST', url))
+    monkeypatch.setattr(requests, 'get', lambda url, **kwargs: http.despachar('GET', url))
+    return http
+
+
+@pytest.fixture
+def verify_responde(fake_http):
+    """Registra a resposta do endpoint de verificação do token"""
+    return lambda resposta: fake_http.registrar('POST', auth_module.VERIFY_URL, resposta)
+
 
 @pytest.fixture
+def me_responde(fake_http):
+    """Registra a resposta do endpoint /me"""
+    return lambda resposta: fake_http.registrar('GET', auth_module.ME_URL, resposta)
+
+
+@pytest.fixture(scope='module')
 def auth():
-    """Fixture para RemoteJWTAuthentication"""
+    """RemoteJWTAuthentication compartilhada: a classe não guarda estado entre chamadas"""
     return RemoteJWTAuthentication()
 
 
-@pytest.fixture
+@pytest.fixture(scope='module')
 def mock_request_with_token():
-    """Fixture para request mockado com token Bearer"""
-    request = Mock()
-    request.META = {'HTTP_AUTHORIZATION': 'Bearer fake_token_12345'}
-    return request
+    """Request com token Bearer; os testes apenas leem request.META"""
+    return SimpleNamespace(META={'HTTP_AUTHORIZATION': 'Bearer fake_token_12345'})
+
+
+@pytest.fixture
+def stub_auth_methods(auth, monkeypatch):
+    """
+    Substitui _verify_and_get_payload e _get_user_info da instância compartilhada.
+    Uso: stub_auth_methods(payload, user_info).
+    """
+    def _aplicar(payload, user_info=None):
+        monkeypatch.setattr(auth, '_verify_and_get_payload', lambda token: payload)
+        monkeypatch.setattr(
+            auth, '_get_user_info', lambda token, username: user_info or {}
+        )
+
+    return _aplicar
 
 
-@pytest.mark.django_db
 class TestRemoteJWTAuthenticationVerifyPayload:
     """Testes para _verify_and_get_payload"""
     
-    def test_verify_request_exception_raises_authentication_failed(self, auth):
+    def test_verify_request_exception_raises_authentication_failed(self, auth, verify_responde):
         """Testa que RequestException ao chamar o serviço de auth lança AuthenticationFailed"""
-        with patch('requests.post') as mock_post:
-            mock_post.side_effect = requests.RequestException('Connection error')
-            
-            with pytest.raises(AuthenticationFailed) as exc_info:
-                auth._verify_and_get_payload('fake_token')
-            
-            assert 'Falha ao contatar serviço de autenticação' in str(exc_info.value)
+        verify_responde(_RequestException('Connection error'))
+        
+        with pytest.raises(AuthenticationFailed) as exc_info:
+            auth._verify_and_get_payload('fake_token')
+        
+        assert exc_info.value.detail.startswith('Falha ao contatar serviço de autenticação')
     
-    def test_verify_non_200_raises_authentication_failed(self, auth):
+    def test_verify_non_200_raises_authentication_failed(self, auth, verify_responde):
         """Testa que resposta não-200 do serviço lança AuthenticationFailed"""
-        with patch('requests.post') as mock_post:
-            mock_response = Mock()
-            mock_response.status_code = 401
-            mock_post.return_value = mock_response
-            
-            with pytest.raises(AuthenticationFailed) as exc_info:
-                auth._verify_and_get_payload('fake_token')
-            
-            assert 'Token inválido ou expirado' in str(exc_info.value)
-    
-    def test_verify_jwt_decode_error_raises_authentication_failed(self, auth):
-        """Testa que erro ao decodificar JWT lança AuthenticationFailed"""
-        with patch('requests.post') as mock_post, \
-             patch('jwt.decode') as mock_decode:
-            
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_post.return_value = mock_response
-            
-            mock_decode.side_effect = jwt.PyJWTError('Invalid token')
-            
-            with pytest.raises(AuthenticationFailed) as exc_info:
-                auth._verify_and_get_payload('fake_token')
-            
-            assert 'Token malformado' in str(exc_info.value)
-    
-    def test_verify_caches_payload(self, auth):
-        """Testa que payload é cacheado e não chama requests novamente"""
-        # Limpar cache antes do teste
-        cache.clear()
+        verify_responde(_RESP_401)
         
-        with patch('requests.post') as mock_post, \
-             patch('jwt.decode') as mock_decode:
-            
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_post.return_value = mock_response
-            
-            # Payload com exp distante no futuro
-            payload = {
-                'username': 'testuser',
-                'exp': int(time.time()) + 3600  # Expira em 1 hora
-            }
-            mock_decode.return_value = payload
-            
-            # Primeira chamada
-            result1 = auth._verify_and_get_payload('fake_token')
-            
-            # Segunda chamada com mesmo token
-            result2 = auth._verify_and_get_payload('fake_token')
-            
-            # Deve ter chamado requests.post apenas uma vez
-            assert mock_post.call_count == 1
-            assert result1 == payload
-            assert result2 == payload
-
-
-@pytest.mark.django_db
-class TestRemoteJWTAuthenticationGetUserInfo:
-    """Testes para _get_user_info"""
-    
-    def test_get_user_info_request_exception_returns_empty_dict(self, auth):
-        """Testa que RequestException retorna dicionário vazio"""
-        with patch('requests.get') as mock_get:
-            mock_get.side_effect = requests.RequestException('Connection error')
-            
-            result = auth._get_user_info('fake_token', 'testuser')
-            
-            assert result == {}
-    
-    def test_get_user_info_non_200_returns_empty_dict(self, auth):
-        """Testa que resposta não-200 retorna dicionário vazio"""
-        with patch('requests.get') as mock_get:
-            mock_response = Mock()
-            mock_response.status_code = 404
-            mock_get.return_value = mock_response
-            
-            result = auth._get_user_info('fake_token', 'testuser')
-            
-            assert result == {}
-    
-    def test_get_user_info_success_returns_parsed_data(self, auth):
-        """Testa que resposta 200 retorna dados parseados"""
-        # Limpar cache
-        cache.clear()
+        with pytest.raises(AuthenticationFailed) as exc_info:
+            auth._verify_and_get_payload('fake_token')
         
-        with patch('requests.get') as mock_get:
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.json.return_value = {
-                'name': 'Test User',
-                'cargo_codigo': 123
-            }
-            mock_get.return_value = mock_response
-            
-            result = auth._get_user_info('fake_token', 'testuser')
-            
-            assert result['name'] == 'Test User'
-            assert result['cargo_codigo'] == 123
+        assert exc_info.value.detail == 'Token inválido ou expirado.'
     
-    def test_get_user_info_caches_result(self, auth):
-        """Testa que resultado é cacheado"""
-        cache.clear()
+    def test_verify_jwt_decode_error_raises_authentication_failed(
+        self, auth, verify_responde, monkeypatch
+    ):
+        """Testa que erro ao decodificar JWT lança AuthenticationFailed"""
+        def fake_decode(*args, **kwargs):
+            raise _PyJWTError('Invalid token')
         
-        with patch('requests.get') as mock_get:
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.json.return_value = {'name': 'Test User'}
-            mock_get.return_value = mock_response
-            
-            # Primeira chamada
-            result1 = auth._get_user_info('fake_token', 'testuser')
-            
-            # Segunda chamada
-            result2 = auth._get_user_info('fake_token', 'testuser')
-            
-            # Deve ter chamado requests.get apenas uma vez
-            assert mock_get.call_count == 1
-            assert result1 == result2
-
-
-@pytest.mark.django_db
-class TestRemoteJWTAuthenticationParseUserData:
-    """Testes para _parse_user_data"""
-    
-    def test_parse_user_data_basic_fields(self, auth):
-        """Testa parsing de campos básicos"""
-        user_data = {
-            'name': 'Test User',
-            'cargo_codigo': 123
-        }
+        verify_responde(_RESP_200)
+        monkeypatch.setattr(jwt, 'decode', fake_decode)
         
-        result = auth._parse_user_data(user_data)
+        with pytest.raises(AuthenticationFailed) as exc_info:
+            auth._verify_and_get_payload('fake_token')
         
-        assert result['name'] == 'Test User'
-        assert result['cargo_codigo'] == 123
-        assert result['unidade_codigo_eol'] is None
-        assert result['dre_codigo_eol'] is None
+        assert exc_info.value.detail == 'Token malformado.'
     
-    def test_parse_user_data_with_first_name(self, auth):
-        """Testa parsing quando tem first_name em vez de name"""
-        user_data = {
-            'first_name': 'Test User',
-            'perfil_codigo': 456
-        }
-        
-        result = auth._parse_user_data(user_data)
+    @time_machine.travel(_AGORA, tick=False)
+    def test_verify_caches_payload(self, auth, fake_http, verify_responde, monkeypatch):
+        """Testa que payload é cacheado e não chama requests novamente"""
+        payload = _PAYLOAD_USERNAME
+        verify_responde(_RESP_200)
+        monkeypatch.setattr(jwt, 'decode', lambda *args, **kwargs: payload)
         
-        assert result['name'] == 'Test User'
-        assert result['cargo_codigo'] == 456
-    
-    def test_parse_user_data_with_direct_eol_codes(self, auth):
-        """Testa parsing com códigos EOL diretos"""
-        user_data = {
-            'name': 'Test',
-            'unidade_codigo_eol': 'UNI123',
-            'dre_codigo_eol': 'DRE456'
-        }
+        # Primeira chamada
+        result1 = auth._verify_and_get_payload('fake_token')
         
-        result = auth._parse_user_data(user_data)
+        # Segunda chamada com mesmo token
+        result2 = auth._verify_and_get_payload('fake_token')
         
-        assert result['unidade_codigo_eol'] == 'UNI123'
-        assert result['dre_codigo_eol'] == 'DRE456'
+        # Deve ter chamado o serviço de verificação apenas uma vez
+        assert fake_http.chamadas == [('POST', auth_module.VERIFY_URL)]
+        assert result1 == payload
+        assert result2 == payload
+
+
+class TestRemoteJWTAuthenticationGetUserInfo:
+    """Testes para _get_user_info"""
     
-    def test_parse_user_data_with_nested_unidade(self, auth):
-        """Testa parsing com estrutura aninhada de unidade"""
-        user_data = {
-            'name': 'Test',
-            'unidade': {
-                'codigo_eol': 'UNI789',
-                'dre': {
-                    'codigo_eol': 'DRE321'
-                }
-            }
-        }
+    @pytest.mark.parametrize('resposta, esperado', [
+        (_RequestException('Connection error'), {}),
+        (_RESP_404, {}),
+        (
+            _RESP_200_USER,
+            {'name': 'Test User', 'cargo_codigo': 123,
+             'unidade_codigo_eol': None, 'dre_codigo_eol': None},
+        ),
+    ], ids=['request_exception_returns_empty_dict', 'non_200_returns_empty_dict',
+            'success_returns_parsed_data'])
+    def test_get_user_info(self, auth, me_responde, resposta, esperado):
+        """Testa o retorno de _get_user_info para cada resultado do /me"""
+        me_responde(resposta)
         
-        result = auth._parse_user_data(user_data)
-        
-        assert result['unidade_codigo_eol'] == 'UNI789'
-        assert result['dre_codigo_eol'] == 'DRE321'
+        assert auth._get_user_info('fake_token', 'testuser') == esperado
     
-    def test_parse_user_data_with_escola(self, auth):
-        """Testa parsing quando unidade está como 'escola'"""
-        user_data = {
-            'name': 'Test',
-            'escola': {
-                'codigo': 'ESC123',
-                'dre': {
-                    'codigo': 'DRE999'
-                }
-            }
-        }
+    @time_machine.travel(_AGORA, tick=False)
+    def test_get_user_info_caches_result(self, auth, fake_http, me_responde):
+        """Testa que resultado é cacheado"""
+        me_responde(_RESP_200_USER)
         
-        result = auth._parse_user_data(user_data)
+        # Primeira chamada
+        result1 = auth._get_user_info('fake_token', 'testuser')
         
-        assert result['unidade_codigo_eol'] == 'ESC123'
-        assert result['dre_codigo_eol'] == 'DRE999'
-    
-    def test_parse_user_data_with_top_level_dre(self, auth):
-        """Testa parsing com DRE em nível superior"""
-        user_data = {
-            'name': 'Test',
-            'dre': {
-                'codigo_eol': 'DRE_TOP'
-            }
-        }
+        # Segunda chamada
+        result2 = auth._get_user_info('fake_token', 'testuser')
         
-        result = auth._parse_user_data(user_data)
-        
-        assert result['dre_codigo_eol'] == 'DRE_TOP'
+        # Deve ter chamado o /me apenas uma vez
+        assert fake_http.call_count == 1
+        assert result1 == result2
+
+
+class TestRemoteJWTAuthenticationParseUserData:
+    """Testes para _parse_user_data"""
+    
+    @pytest.mark.parametrize('user_data, esperado', [
+        # Campos básicos
+        (
+            {'name': 'Test User', 'cargo_codigo': 123},
+            {'name': 'Test User', 'cargo_codigo': 123,
+             'unidade_codigo_eol': None, 'dre_codigo_eol': None},
+        ),
+        # first_name e perfil_codigo em vez de name e cargo_codigo
+        (
+            {'first_name': 'Test User', 'perfil_codigo': 456},
+            {'name': 'Test User', 'cargo_codigo': 456,
+             'unidade_codigo_eol': None, 'dre_codigo_eol': None},
+        ),
+        # Códigos EOL diretos
+        (
+            {'name': 'Test', 'unidade_codigo_eol': 'UNI123', 'dre_codigo_eol': 'DRE456'},
+            {'name': 'Test', 'cargo_codigo': None,
+             'unidade_codigo_eol': 'UNI123', 'dre_codigo_eol': 'DRE456'},
+        ),
+        # Estrutura aninhada de unidade
+        (
+            {'name': 'Test', 'unidade': {'codigo_eol': 'UNI789', 'dre': {'codigo_eol': 'DRE321'}}},
+            {'name': 'Test', 'cargo_codigo': None,
+             'unidade_codigo_eol': 'UNI789', 'dre_codigo_eol': 'DRE321'},
+        ),
+        # Unidade informada como 'escola'
+        (
+            {'name': 'Test', 'escola': {'codigo': 'ESC123', 'dre': {'codigo': 'DRE999'}}},
+            {'name': 'Test', 'cargo_codigo': None,
+             'unidade_codigo_eol': 'ESC123', 'dre_codigo_eol': 'DRE999'},
+        ),
+        # DRE em nível superior
+        (
+            {'name': 'Test', 'dre': {'codigo_eol': 'DRE_TOP'}},
+            {'name': 'Test', 'cargo_codigo': None,
+             'unidade_codigo_eol': None, 'dre_codigo_eol': 'DRE_TOP'},
+        ),
+    ], ids=[
+        'basic_fields', 'first_name', 'direct_eol_codes',
+        'nested_unidade', 'escola', 'top_level_dre',
+    ])
+    def test_parse_user_data(self, auth, user_data, esperado):
+        """Testa parsing dos dados do usuário nos formatos aceitos"""
+        assert auth._parse_user_data(user_data) == esperado
 
 
-@pytest.mark.django_db
 class TestRemoteJWTAuthenticationAuthenticate:
     """Testes para método authenticate completo"""
     
-    def test_authenticate_success_flow(self, auth, mock_request_with_token):
-        """Testa fluxo completo de autenticação bem-sucedida"""
-        payload = {
-            'username': 'testuser',
-            'name': 'Test User',
-            'perfil_codigo': 123,
-            'exp': int(time.time()) + 3600
-        }
+    @pytest.mark.parametrize('payload, user_info, esperado, erro', [
+        (
+            _PAYLOAD_COMPLETO,
+            {'unidade_codigo_eol': 'UNI123', 'dre_codigo_eol': 'DRE456'},
+            {
+                'username': 'testuser',
+                'name': 'Test User',
+                'cargo_codigo': 123,
+                'unidade_codigo_eol': 'UNI123',
+                'dre_codigo_eol': 'DRE456',
+            },
+            None,
+        ),
+        # Usa 'sub' quando 'username' não existe
+        (_PAYLOAD_SUB, None, {'username': 'user_from_sub'}, None),
+        # Payload sem username, sub ou user_id
+        (_PAYLOAD_SEM_USERNAME, None, None, "Token sem 'username' ou 'sub'."),
+    ], ids=['success_flow', 'uses_sub_as_fallback', 'missing_username_raises'])
+    def test_authenticate_fluxos(
+        self, auth, mock_request_with_token, stub_auth_methods,
+        payload, user_info, esperado, erro
+    ):
+        """Testa o fluxo de authenticate a partir do payload verificado"""
+        stub_auth_methods(payload, user_info)
         
-        user_info = {
-            'unidade_codigo_eol': 'UNI123',
-            'dre_codigo_eol': 'DRE456'
-        }
+        if erro:
+            with pytest.raises(AuthenticationFailed) as exc_info:
+                auth.authenticate(mock_request_with_token)
+            assert exc_info.value.detail == erro
+            return
         
-        with patch.object(auth, '_verify_and_get_payload', return_value=payload), \
-             patch.object(auth, '_get_user_info', return_value=user_info):
-            
-            user, token_data = auth.authenticate(mock_request_with_token)
-            
-            # Verificar tipo e atributos do usuário
-            assert user.__class__.__name__ == 'ExternalUser'
-            assert user.username == 'testuser'
-            assert user.name == 'Test User'
-            assert user.cargo_codigo == 123
-            assert user.unidade_codigo_eol == 'UNI123'
-            assert user.dre_codigo_eol == 'DRE456'
-            assert user.is_authenticated is True
-            assert token_data is None
+        user, token_data = auth.authenticate(mock_request_with_token)
+        
+        assert user.__class__.__name__ == 'ExternalUser'
+        assert user.is_authenticated is True
+        assert token_data is None
+        for campo, valor in esperado.items():
+            assert getattr(user, campo) == valor
     
     def test_authenticate_no_bearer_header_returns_none(self, auth):
         """Testa que request sem Bearer retorna None"""
-        request = Mock()
-        request.META = {}
+        request = SimpleNamespace(META={})
         
         result = auth.authenticate(request)
         
@@ -300,36 +324,8 @@ class TestRemoteJWTAuthenticationAuthenticate:
     
     def test_authenticate_invalid_header_format_returns_none(self, auth):
         """Testa que header malformado retorna None"""
-        request = Mock()
-        request.META = {'HTTP_AUTHORIZATION': 'Basic invalid'}
+        request = SimpleNamespace(META={'HTTP_AUTHORIZATION': 'Basic invalid'})
         
         result = auth.authenticate(request)
         
         assert result is None
-    
-    def test_authenticate_missing_username_raises(self, auth, mock_request_with_token):
-        """Testa que payload sem username lança AuthenticationFailed"""
-        payload = {
-            'exp': int(time.time()) + 3600
-            # Sem username, sub ou user_id
-        }
-        
-        with patch.object(auth, '_verify_and_get_payload', return_value=payload):
-            with pytest.raises(AuthenticationFailed) as exc_info:
-                auth.authenticate(mock_request_with_token)
-            
-            assert "Token sem 'username' ou 'sub'" in str(exc_info.value)
-    
-    def test_authenticate_uses_sub_as_fallback(self, auth, mock_request_with_token):
-        """Testa que usa 'sub' quando 'username' não existe"""
-        payload = {
-            'sub': 'user_from_sub',
-            'exp': int(time.time()) + 3600
-        }
-        
-        with patch.object(auth, '_verify_and_get_payload', return_value=payload), \
-             patch.object(auth, '_get_user_info', return_value={}):
-            
-            user, _ = auth.authenticate(mock_request_with_token)
-            
-            assert user.username == 'user_from_sub'
@@ -4,19 +4,23 @@ Testes para spectacular_ext.py
 Testa a extensão OpenAPI para autenticação JWT customizada.
 """
 import pytest
-from unittest.mock import Mock
 from anexos.spectacular_ext import RemoteJWTAuthScheme
 
+# Testes unitários puros (sem banco): podem rodar isolados com -m unit
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture(scope='module')
+def scheme():
+    """Extensão compartilhada; get_security_definition não inspeciona o target"""
+    return RemoteJWTAuthScheme(target=object())
+
 
 class TestRemoteJWTAuthScheme:
     """Testes para RemoteJWTAuthScheme"""
     
-    def test_get_security_definition_structure(self):
+    def test_get_security_definition_structure(self, scheme):
         """Testa que get_security_definition retorna estrutura correta"""
-        # Criar um mock target para passar ao construtor
-        mock_target = Mock()
-        scheme = RemoteJWTAuthScheme(target=mock_target)
-        
         # Passar None como auto_schema (não é usado no método)
         result = scheme.get_security_definition(auto_schema=None)
         
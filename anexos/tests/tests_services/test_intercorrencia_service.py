@@ -1,8 +1,14 @@
+import socket
+import time
+
 import pytest
 import requests
 from unittest.mock import patch, MagicMock
 
-from django.conf import settings   
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from anexos.services import intercorrencia_service
 from anexos.services.intercorrencia_service import (
     get_detalhes_intercorrencia,
     ExternalServiceError
@@ -13,9 +19,25 @@ class TestIntercorrenciaService:
     def setup_method(self):
         self.intercorrencia_uuid = "123e4567-e89b-12d3-a456-426614174000"
         self.token = "test_token"   
+        # URL esperada montada de forma independente do módulo testado
+        self.url = (
+            f"{settings.INTERCORRENCIAS_API_URL.rstrip('/')}"
+            f"/verify-intercorrencia/{self.intercorrencia_uuid}/"
+        )
+
+    @pytest.fixture(scope="class", autouse=True)
+    def _patched_get(self, request):
+        """Aplica o patch de _session.get uma única vez para toda a classe"""
+        with patch("anexos.services.intercorrencia_service._session.get") as mock_get:
+            request.cls.mock_get = mock_get
+            yield mock_get
+
+    @pytest.fixture(autouse=True)
+    def _reset_mock_get(self, _patched_get):
+        """Restaura o mock de _session.get antes de cada teste"""
+        _patched_get.reset_mock(return_value=True, side_effect=True)
         
-    @patch("anexos.services.intercorrencia_service.requests.get")
-    def test_get_detalhes_intercorrencia_sucesso(self, mock_get):
+    def test_get_detalhes_intercorrencia_sucesso(self):
         """Testa obtenção bem-sucedida dos detalhes da intercorrência"""
         mock_response = MagicMock()
         mock_response.raise_for_status.return_value = None
@@ -23,54 +45,51 @@ class TestIntercorrenciaService:
             "uuid": self.intercorrencia_uuid,
             "descricao": "Intercorrência de teste"
         }
-        mock_get.return_value = mock_response
+        self.mock_get.return_value = mock_response
 
         detalhes = get_detalhes_intercorrencia(self.intercorrencia_uuid, self.token)
 
         assert detalhes["uuid"] == self.intercorrencia_uuid
         assert detalhes["descricao"] == "Intercorrência de teste"
-        mock_get.assert_called_once_with(
-            f"{settings.INTERCORRENCIAS_API_URL.rstrip('/')}/verify-intercorrencia/{self.intercorrencia_uuid}/",
+        self.mock_get.assert_called_once_with(
+            self.url,
             headers={"Authorization": f"Bearer {self.token}"},
-            timeout=5
+            timeout=(1, 5)
         )  
         
-    @patch("anexos.services.intercorrencia_service.requests.get")
-    def test_get_detalhes_intercorrencia_http_error(self, mock_get):
+    def test_get_detalhes_intercorrencia_http_error(self):
         """Testa tratamento de erro HTTP ao obter detalhes da intercorrência"""
         mock_response = MagicMock()
         mock_response.raise_for_status.side_effect = requests.HTTPError(response=mock_response)
         mock_response.json.return_value = {"detail": "Intercorrência não encontrada"}
-        mock_get.return_value = mock_response
+        self.mock_get.return_value = mock_response
 
         with pytest.raises(ExternalServiceError) as exc_info:
             get_detalhes_intercorrencia(self.intercorrencia_uuid, self.token)
 
         assert "Intercorrência não encontrada" in str(exc_info.value)
-        mock_get.assert_called_once_with(
-            f"{settings.INTERCORRENCIAS_API_URL.rstrip('/')}/verify-intercorrencia/{self.intercorrencia_uuid}/",
+        self.mock_get.assert_called_once_with(
+            self.url,
             headers={"Authorization": f"Bearer {self.token}"},
-            timeout=5
+            timeout=(1, 5)
         )
         
         
-    @patch("anexos.services.intercorrencia_service.requests.get")
-    def test_get_detalhes_intercorrencia_request_exception(self, mock_get):
+    def test_get_detalhes_intercorrencia_request_exception(self):
         """Testa tratamento de exceção de requisição ao obter detalhes da intercorrência"""
-        mock_get.side_effect = requests.RequestException("Erro de conexão")
+        self.mock_get.side_effect = requests.RequestException("Erro de conexão")
 
         with pytest.raises(ExternalServiceError) as exc_info:
             get_detalhes_intercorrencia(self.intercorrencia_uuid, self.token)
 
         assert "Não foi possível obter detalhes da intercorrência" in str(exc_info.value)
-        mock_get.assert_called_once_with(
-            f"{settings.INTERCORRENCIAS_API_URL.rstrip('/')}/verify-intercorrencia/{self.intercorrencia_uuid}/",
+        self.mock_get.assert_called_once_with(
+            self.url,
             headers={"Authorization": f"Bearer {self.token}"},
-            timeout=5
+            timeout=(1, 5)
         )
     
-    @patch("anexos.services.intercorrencia_service.requests.get")
-    def test_get_detalhes_intercorrencia_http_error_resposta_texto(self, mock_get):
+    def test_get_detalhes_intercorrencia_http_error_resposta_texto(self):
         """Testa tratamento de erro HTTP quando a resposta não é JSON (cai no except Exception)"""
         mock_response = MagicMock()
         mock_response.raise_for_status.side_effect = requests.HTTPError(response=mock_response)
@@ -78,18 +97,55 @@ class TestIntercorrenciaService:
         mock_response.json.side_effect = ValueError("Não é JSON válido")
         # Quando cair no except, deve usar response.text
         mock_response.text = "Erro no servidor: Internal Server Error"
-        mock_get.return_value = mock_response
+        self.mock_get.return_value = mock_response
 
         with pytest.raises(ExternalServiceError) as exc_info:
             get_detalhes_intercorrencia(self.intercorrencia_uuid, self.token)
 
         assert "Erro no servidor: Internal Server Error" in str(exc_info.value)
-        mock_get.assert_called_once_with(
-            f"{settings.INTERCORRENCIAS_API_URL.rstrip('/')}/verify-intercorrencia/{self.intercorrencia_uuid}/",
+        self.mock_get.assert_called_once_with(
+            self.url,
             headers={"Authorization": f"Bearer {self.token}"},
-            timeout=5
+            timeout=(1, 5)
         )
-    
-        
-    
-        
\ No newline at end of file
+
+
+class TestIntercorrenciaServiceSessao:
+    """Testes da configuração da sessão HTTP compartilhada"""
+
+    @pytest.mark.parametrize("url", ["http://servico/", "https://servico/"])
+    def test_adapter_montado_com_pool_e_retry(self, url):
+        """Testa pool de conexões e política de retry do adapter montado"""
+        adapter = intercorrencia_service._session.get_adapter(url)
+
+        assert isinstance(adapter, HTTPAdapter)
+        assert adapter._pool_connections == 10
+        assert adapter._pool_maxsize == 10
+        assert adapter.max_retries.total == 2
+        assert adapter.max_retries.connect == 2
+        assert adapter.max_retries.read == 0
+        assert adapter.max_retries.backoff_factor == 0.1
+
+    @pytest.mark.slow
+    def test_servico_sem_resposta_falha_dentro_do_limite(self, monkeypatch):
+        """Testa que um serviço que aceita a conexão e não responde falha em até ~8,3s"""
+        # Socket em escuta que nunca responde: a conexão é aceita pelo kernel
+        # e a requisição fica aguardando a leitura até o timeout
+        with socket.socket() as servidor:
+            servidor.bind(("127.0.0.1", 0))
+            servidor.listen(5)
+            host, porta = servidor.getsockname()
+            monkeypatch.setattr(
+                intercorrencia_service,
+                "VERIFY_INTERCORRENCIA_URL",
+                f"http://{host}:{porta}/verify-intercorrencia/",
+            )
+
+            inicio = time.monotonic()
+            with pytest.raises(ExternalServiceError):
+                get_detalhes_intercorrencia("123e4567-e89b-12d3-a456-426614174000", "token")
+            duracao = time.monotonic() - inicio
+
+        # A leitura não é refeita: falha após um único timeout de leitura
+        assert 5 <= duracao < 8.3 + 1
+
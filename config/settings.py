@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 import os
 from pathlib import Path
 import environ
+from django.core.exceptions import ImproperlyConfigured
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -94,16 +95,27 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.postgresql",
-        "NAME": env("POSTGRES_DB"),
-        "USER": env("POSTGRES_USER"),
-        "PASSWORD": env("POSTGRES_PASSWORD"),
-        "HOST": env("POSTGRES_HOST", default="db"),
-        "PORT": env("POSTGRES_PORT"),
+# USE_INMEMORY_DB=True troca o Postgres por SQLite em memória (execução rápida dos testes)
+USE_INMEMORY_DB = env.bool("USE_INMEMORY_DB", default=False)
+
+if USE_INMEMORY_DB:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": ":memory:",
+        }
+    }
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": env("POSTGRES_DB"),
+            "USER": env("POSTGRES_USER"),
+            "PASSWORD": env("POSTGRES_PASSWORD"),
+            "HOST": env("POSTGRES_HOST", default="db"),
+            "PORT": env("POSTGRES_PORT"),
+        }
     }
-}
 
 
 # Password validation
@@ -159,6 +171,21 @@ MINIO_BUCKET_NAME = env('MINIO_BUCKET_NAME', default='anexos-intercorrencias')
 MINIO_EXTERNAL_ENDPOINT = env('MINIO_EXTERNAL_ENDPOINT', default=None)
 MINIO_STORAGE_PRESIGNED_URL_TTL = env('MINIO_STORAGE_PRESIGNED_URL_TTL', default=1)
 
+# Opcional: vazio ou ausente usa o padrão de 64MB
+try:
+    MINIO_PART_SIZE = int(env('MINIO_PART_SIZE', default='') or 64 * 1024 * 1024)
+except ValueError:
+    raise ImproperlyConfigured('MINIO_PART_SIZE deve ser um número inteiro de bytes')
+
+# O MinIO exige partes de upload entre 5MB e 5GB
+MINIO_PART_SIZE_MIN = 5 * 1024 * 1024
+MINIO_PART_SIZE_MAX = 5 * 1024 * 1024 * 1024
+if not MINIO_PART_SIZE_MIN <= MINIO_PART_SIZE <= MINIO_PART_SIZE_MAX:
+    raise ImproperlyConfigured(
+        f'MINIO_PART_SIZE deve estar entre {MINIO_PART_SIZE_MIN} e '
+        f'{MINIO_PART_SIZE_MAX} bytes (5MB a 5GB); recebido: {MINIO_PART_SIZE}'
+    )
+
 # URL base para acesso aos arquivos
 if MINIO_EXTERNAL_ENDPOINT:
     MINIO_STORAGE_MEDIA_BASE_URL = MINIO_EXTERNAL_ENDPOINT